@@ -7,13 +7,35 @@ A股自选股智能分析系统 - 核心包
 导出核心 API 供外部使用
 """
 
-# 导出服务层 API
-from .services import analyze_stock, analyze_stocks, perform_market_review
+import importlib
+
+# 导出的 API 按需加载（PEP 562），导入子模块（如 config）时不会连带加载分析链路
+_LAZY_EXPORTS = {
+    # 服务层
+    "analyze_stock": ".services",
+    "analyze_stocks": ".services",
+    "perform_market_review": ".services",
+    # 核心类型
+    "GeminiAnalyzer": ".analyzer",
+    "AnalysisResult": ".analyzer",
+    "get_config": ".config",
+    "Config": ".config",
+    "ReportType": ".enums",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
 
-# 导出核心类型
-from .analyzer import GeminiAnalyzer, AnalysisResult
-from .config import get_config, Config
-from .enums import ReportType
 
 __all__ = [
     # 服务层
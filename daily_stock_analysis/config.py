@@ -50,6 +50,10 @@ class Config:
     gemini_max_retries: int = 5  # 最大重试次数
     gemini_retry_delay: float = 5.0  # 重试基础延时（秒）
 
+    # AI 分析结果本地缓存（相同输入直接复用，实时预测时可关闭）
+    ai_cache_enabled: bool = True
+    ai_cache_ttl: int = 86400  # 缓存有效期（秒），默认 24 小时
+
     # OpenAI 兼容 API（备选，当 Gemini 不可用时使用）
     openai_api_key: Optional[str] = None
     openai_base_url: Optional[str] = None  # 如: https://api.openai.com/v1
@@ -304,6 +308,8 @@ class Config:
             gemini_request_delay=float(os.getenv("GEMINI_REQUEST_DELAY", "2.0")),
             gemini_max_retries=int(os.getenv("GEMINI_MAX_RETRIES", "5")),
             gemini_retry_delay=float(os.getenv("GEMINI_RETRY_DELAY", "5.0")),
+            ai_cache_enabled=os.getenv("AI_CACHE_ENABLED", "true").lower() == "true",
+            ai_cache_ttl=int(os.getenv("AI_CACHE_TTL", "86400")),
             openai_api_key=os.getenv("OPENAI_API_KEY"),
             openai_base_url=os.getenv("OPENAI_BASE_URL"),
             openai_model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
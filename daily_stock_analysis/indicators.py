@@ -0,0 +1,311 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+技术指标计算内核
+===================================
+
+职责：
+1. 单次遍历收盘价序列，同时计算 MA5/10/20/60、EMA12/26、DIF/DEA/MACD、RSI、
+   乖离率 BIAS_MA5/10/20 与涨跌幅 CHANGE_PCT
+2. 安装 numba 时以 @njit 编译为本地代码；未安装时使用 compute_all_numpy（NumPy + pandas ewm）
+
+计算口径：
+- MA: rolling(window=k, min_periods=1).mean()
+- EMA: ewm(span=n, adjust=False).mean()
+- RSI: Wilder 平滑（首个值为前 14 日涨跌幅均值，此前为 NaN）
+- BIAS_MAk: (close - MAk) / MAk * 100
+- CHANGE_PCT: 相对前一日收盘价的涨跌幅（%），首日为 0
+- 缺失收盘价（NaN）：均线跳过缺失值，EMA 沿用前值，只影响当日的乖离率与涨跌幅
+"""
+
+import logging
+from typing import Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # numba 为可选依赖
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """numba 不可用时的空装饰器（保持函数可直接以纯 Python 调用）"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# compute_all 返回数组的顺序，与 DataFrame 列名一一对应
+INDICATOR_COLUMNS = (
+    "MA5",
+    "MA10",
+    "MA20",
+    "MA60",
+    "EMA12",
+    "EMA26",
+    "DIF",
+    "DEA",
+    "MACD",
+    "RSI",
+    "BIAS_MA5",
+    "BIAS_MA10",
+    "BIAS_MA20",
+    "CHANGE_PCT",
+)
+
+
+def moving_averages(close: np.ndarray, windows: Tuple[int, ...]) -> Tuple[np.ndarray, ...]:
+    """
+    基于一次累加和计算多条简单均线（纯 NumPy，numba 不可用时使用）
+
+    等价于 rolling(window=k, min_periods=1).mean()：窗口内只对有效值求均值
+    （窗口未满或含 NaN 时按有效值个数相除，窗口内全为 NaN 时结果为 NaN）
+
+    Args:
+        close: float64 收盘价数组（可含 NaN）
+        windows: 均线周期，如 (5, 10, 20, 60)
+
+    Returns:
+        与 windows 顺序对应的均线数组
+    """
+    n = close.shape[0]
+    # 有效值的累加和与累计个数：NaN 不参与求和，也不计入除数
+    cs = np.concatenate(([0.0], np.nancumsum(close)))
+    cc = np.concatenate(([0], np.cumsum(~np.isnan(close))))
+    end = np.arange(1, n + 1)
+    result = []
+    for k in windows:
+        start = np.maximum(end - k, 0)
+        counts = cc[end] - cc[start]
+        with np.errstate(invalid="ignore"):
+            result.append((cs[end] - cs[start]) / counts)
+    return tuple(result)
+
+
+@njit(cache=True)
+def rsi_wilder(close: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    单次遍历计算 Wilder RSI
+
+    前 period 个涨跌幅取简单均值作为初值，之后按
+    avg = (avg * (period - 1) + x) / period 递推平滑
+
+    Args:
+        close: float64 收盘价数组
+        period: 计算周期
+
+    Returns:
+        RSI 数组（前 period 个值为 NaN）
+    """
+    n = close.shape[0]
+    out = np.empty(n)
+    gain = 0.0
+    loss = 0.0
+    for i in range(n):
+        if i == 0:
+            out[i] = np.nan
+            continue
+        ch = close[i] - close[i - 1]
+        g = ch if ch > 0 else 0.0
+        l = -ch if ch < 0 else 0.0
+        if i <= period:
+            gain += g
+            loss += l
+            if i < period:
+                out[i] = np.nan
+                continue
+            gain /= period
+            loss /= period
+        else:
+            gain = (gain * (period - 1) + g) / period
+            loss = (loss * (period - 1) + l) / period
+
+        if loss > 0:
+            out[i] = 100.0 - 100.0 / (1.0 + gain / loss)
+        elif gain > 0:
+            out[i] = 100.0
+        else:
+            out[i] = np.nan
+    return out
+
+
+@njit(cache=True)
+def _ewm_step(prev: float, old_wt: float, x: float, alpha: float) -> Tuple[float, float]:
+    """
+    ewm(adjust=False).mean() 的单步递推（与 pandas 默认 ignore_na=False 口径一致）
+
+    缺失值处输出沿用上一个值，但旧权重继续按 (1 - alpha) 衰减，
+    下一个有效值按间隔后的权重并入
+
+    Returns:
+        (本步输出, 旧值权重)
+    """
+    if np.isnan(prev):  # 尚未出现有效值
+        return x, 1.0
+    old_wt *= 1.0 - alpha
+    if not np.isnan(x):
+        if prev != x:
+            prev = (old_wt * prev + alpha * x) / (old_wt + alpha)
+        old_wt = 1.0
+    return prev, old_wt
+
+
+@njit(cache=True)
+def compute_all(close: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    单次遍历计算全部技术指标
+
+    缺失的收盘价（NaN）与 pandas 口径一致：均线只对窗口内有效值求均值，
+    EMA 沿用上一个值并继续衰减权重，不会让之后的结果全部变为 NaN
+
+    Args:
+        close: float64 收盘价数组（连续内存，可含 NaN）
+
+    Returns:
+        按 INDICATOR_COLUMNS 顺序排列的 14 个数组
+    """
+    n = close.shape[0]
+    ma5 = np.empty(n)
+    ma10 = np.empty(n)
+    ma20 = np.empty(n)
+    ma60 = np.empty(n)
+    ema12 = np.empty(n)
+    ema26 = np.empty(n)
+    dif = np.empty(n)
+    dea = np.empty(n)
+    macd = np.empty(n)
+    bias5 = np.empty(n)
+    bias10 = np.empty(n)
+    bias20 = np.empty(n)
+    change = np.empty(n)
+
+    a12 = 2.0 / 13.0
+    a26 = 2.0 / 27.0
+    a9 = 2.0 / 10.0
+
+    # 各均线窗口内有效值的累加和与个数（下标 0..3 对应 MA5/10/20/60）
+    windows = (5, 10, 20, 60)
+    sums = np.zeros(4)
+    counts = np.zeros(4, dtype=np.int64)
+    mas = (ma5, ma10, ma20, ma60)
+
+    e12 = np.nan
+    e26 = np.nan
+    e9 = np.nan
+    w12 = 1.0
+    w26 = 1.0
+    w9 = 1.0
+
+    for i in range(n):
+        c = close[i]
+        valid = not np.isnan(c)
+
+        # 均线：滑动窗口累加和，只统计有效值；窗口内无有效值时为 NaN
+        for j in range(4):
+            k = windows[j]
+            if valid:
+                sums[j] += c
+                counts[j] += 1
+            if i >= k and not np.isnan(close[i - k]):
+                sums[j] -= close[i - k]
+                counts[j] -= 1
+            if counts[j] > 0:
+                mas[j][i] = sums[j] / counts[j]
+            else:
+                sums[j] = 0.0  # 清掉浮点残差
+                mas[j][i] = np.nan
+
+        # 乖离率与涨跌幅
+        bias5[i] = (c - ma5[i]) / ma5[i] * 100.0
+        bias10[i] = (c - ma10[i]) / ma10[i] * 100.0
+        bias20[i] = (c - ma20[i]) / ma20[i] * 100.0
+        if i == 0:
+            change[i] = 0.0
+        else:
+            change[i] = (c - close[i - 1]) / close[i - 1] * 100.0
+
+        # EMA / MACD：递推公式 e = alpha * x + (1 - alpha) * e_prev
+        e12, w12 = _ewm_step(e12, w12, c, a12)
+        e26, w26 = _ewm_step(e26, w26, c, a26)
+        ema12[i] = e12
+        ema26[i] = e26
+        dif[i] = e12 - e26
+        e9, w9 = _ewm_step(e9, w9, dif[i], a9)
+        dea[i] = e9
+        macd[i] = (dif[i] - dea[i]) * 2.0
+
+    rsi = rsi_wilder(close, 14)
+
+    return (
+        ma5,
+        ma10,
+        ma20,
+        ma60,
+        ema12,
+        ema26,
+        dif,
+        dea,
+        macd,
+        rsi,
+        bias5,
+        bias10,
+        bias20,
+        change,
+    )
+
+
+def compute_all_numpy(close: np.ndarray) -> Tuple[np.ndarray, ...]:
+    """
+    compute_all 的 NumPy / pandas 版本（numba 不可用时使用）
+
+    返回顺序与计算口径同 compute_all
+
+    Args:
+        close: float64 收盘价数组（可含 NaN）
+
+    Returns:
+        按 INDICATOR_COLUMNS 顺序排列的 14 个数组
+    """
+    # 均线：一次累加和得到全部周期
+    ma5, ma10, ma20, ma60 = moving_averages(close, (5, 10, 20, 60))
+
+    # EMA12 / EMA26 / MACD
+    series = pd.Series(close)
+    ema12 = series.ewm(span=12, adjust=False).mean().to_numpy()
+    ema26 = series.ewm(span=26, adjust=False).mean().to_numpy()
+    dif = ema12 - ema26
+    dea = pd.Series(dif).ewm(span=9, adjust=False).mean().to_numpy()
+    macd = (dif - dea) * 2
+
+    # RSI（Wilder 平滑，单次遍历）
+    rsi = rsi_wilder(close, 14)
+
+    # 乖离率与涨跌幅
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bias5 = (close - ma5) / ma5 * 100
+        bias10 = (close - ma10) / ma10 * 100
+        bias20 = (close - ma20) / ma20 * 100
+        change = np.zeros_like(close)
+        change[1:] = (close[1:] - close[:-1]) / close[:-1] * 100
+
+    return (
+        ma5,
+        ma10,
+        ma20,
+        ma60,
+        ema12,
+        ema26,
+        dif,
+        dea,
+        macd,
+        rsi,
+        bias5,
+        bias10,
+        bias20,
+        change,
+    )
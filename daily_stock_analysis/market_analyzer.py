@@ -10,22 +10,159 @@
 3. 使用大模型生成每日大盘复盘报告
 """
 
+import atexit
 import logging
-import re
+import sys
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from functools import lru_cache
+from itertools import repeat
+from types import ModuleType
+from typing import Optional, Dict, Any, List, Tuple
 
-import akshare as ak
+import numpy as np
 import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from daily_stock_analysis.config import get_config
+from daily_stock_analysis.indicators import NUMBA_AVAILABLE, njit
 from daily_stock_analysis.search_service import SearchService
 
 logger = logging.getLogger(__name__)
 
 
+def _akshare() -> ModuleType:
+    """
+    返回 akshare 模块（首次调用时才导入）
+
+    akshare 包含上千个子模块，导入耗时数秒，只在真正取数时再加载。
+    不使用 importlib.util.LazyLoader：它在 exec_module 完成前就切换模块类型，
+    并发线程首次访问属性时会拿到未初始化完的模块（AttributeError）；
+    普通 import 由导入系统的模块锁保护，其余线程会等待首个线程导入完成
+    """
+    import akshare
+    return akshare
+
+# 指数实时行情中使用的数值列（东方财富 / 新浪列名一致）
+_SPOT_COLUMNS = ['最新价', '涨跌额', '涨跌幅', '今开', '最高', '最低', '昨收', '成交量', '成交额']
+# 指数日线历史数据中使用的数值列
+_HISTORY_COLUMNS = ['open', 'high', 'low', 'close', 'volume', 'amount']
+
+
+def _numeric_block(df: pd.DataFrame, columns: List[str]) -> np.ndarray:
+    """
+    把指定列一次性转换为 float64 矩阵（缺失列、无法解析的值均记为 0）
+
+    Args:
+        df: 原始 DataFrame
+        columns: 需要的列名
+
+    Returns:
+        形状为 (len(df), len(columns)) 的 ndarray
+    """
+    block = df.reindex(columns=columns).apply(pd.to_numeric, errors='coerce')
+    return block.to_numpy(dtype=np.float64, na_value=0.0)
+
+
+def _minute_bucket() -> str:
+    """当前分钟标识，作为行情快照缓存的键（同一分钟内复用结果）"""
+    return datetime.now().strftime('%Y%m%d%H%M')
+
+
+# 东方财富全市场快照按分钟缓存：同一分钟内重复调用直接复用，不再重新下载
+# 注意：返回的 DataFrame 为共享对象，调用方不得原地修改
+@lru_cache(maxsize=8)
+def _spot_index_em(minute_bucket: str) -> pd.DataFrame:
+    """指数实时行情（东方财富）"""
+    return _akshare().stock_zh_index_spot_em()
+
+
+@lru_cache(maxsize=8)
+def _spot_a_em(minute_bucket: str) -> pd.DataFrame:
+    """A 股实时行情（东方财富）"""
+    return _akshare().stock_zh_a_spot_em()
+
+
+@lru_cache(maxsize=8)
+def _board_industry_em(minute_bucket: str) -> pd.DataFrame:
+    """行业板块行情（东方财富）"""
+    return _akshare().stock_board_industry_name_em()
+
+
+def _top_k_positions(keys: np.ndarray, k: int) -> np.ndarray:
+    """
+    返回 keys 中最小的 k 个元素的位置（按值升序）
+
+    取最大值时传入 -keys 即可
+    """
+    if keys.shape[0] <= k:
+        return np.argsort(keys, kind='stable')
+    idx = np.argpartition(keys, k)[:k]
+    return idx[np.argsort(keys[idx], kind='stable')]
+
+
+@njit(cache=True)
+def _compute_stats(change_pct: np.ndarray, amount: np.ndarray):
+    """
+    单次遍历统计涨跌家数、涨跌停家数与成交额合计
+
+    涨跌幅为 NaN 的股票不计入任何家数，成交额为 NaN 时跳过
+
+    Returns:
+        (上涨, 下跌, 平盘, 涨停, 跌停, 成交额合计)
+    """
+    up = 0
+    down = 0
+    flat = 0
+    limit_up = 0
+    limit_down = 0
+    total = 0.0
+    for i in range(change_pct.shape[0]):
+        c = change_pct[i]
+        if c > 0:
+            up += 1
+            if c >= 9.9:
+                limit_up += 1
+        elif c < 0:
+            down += 1
+            if c <= -9.9:
+                limit_down += 1
+        elif c == 0:
+            flat += 1
+        a = amount[i]
+        if a == a:
+            total += a
+    return up, down, flat, limit_up, limit_down, total
+
+
+# 直连行情接口共享的 HTTP 连接池：复用 TCP+TLS 连接，避免每次请求重新握手
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=8,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
+_SESSION.headers['User-Agent'] = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+_SESSION.headers['Accept-Encoding'] = 'gzip'
+atexit.register(_SESSION.close)
+
+# 指数代码 -> 带交易所前缀的代码（腾讯 / 新浪接口通用）
+_CODE_TO_QQ = {
+    '000001': 'sh000001',
+    '399001': 'sz399001',
+    '399006': 'sz399006',
+    '000688': 'sh000688',
+    '000016': 'sh000016',
+    '000300': 'sh000300',
+}
+
+# 腾讯行情数值字段下标：现价、昨收、开盘、成交量、涨跌额、涨跌幅、最高、最低
+_QQ_FIELDS = (3, 4, 5, 6, 31, 32, 33, 34)
+
+
 def _fetch_qq_index_data(codes: List[str]) -> Dict[str, Dict]:
     """
     直接从腾讯接口获取指数数据（AkShare 备用方案）
@@ -33,52 +170,78 @@ def _fetch_qq_index_data(codes: List[str]) -> Dict[str, Dict]:
     腾讯接口格式: v_sh000001="1~上证指数~000001~价格~昨收~开盘~成交量~...~涨跌额~涨跌幅~最高~最低~..."
     """
     result = {}
-    code_map = {
-        '000001': 'sh000001',
-        '399001': 'sz399001', 
-        '399006': 'sz399006',
-        '000688': 'sh000688',
-        '000016': 'sh000016',
-        '000300': 'sh000300',
-    }
-    
-    qq_codes = [code_map[c] for c in codes if c in code_map]
+    qq_codes = [_CODE_TO_QQ[c] for c in codes if c in _CODE_TO_QQ]
     if not qq_codes:
         return result
         
     try:
         url = f"https://qt.gtimg.cn/q={','.join(qq_codes)}"
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-        resp = requests.get(url, headers=headers, timeout=10)
-        resp.encoding = 'gbk'
+        # (连接超时, 读取超时)：连接阶段快速失败
+        resp = _SESSION.get(url, timeout=(3.05, 10))
         
-        for line in resp.text.strip().split(';'):
-            if not line.strip():
+        # 直接处理原始字节：只有名称字段含中文，仅对该字段做 GBK 解码
+        for line in resp.content.split(b';'):
+            line = line.strip()
+            if not line:
                 continue
-            match = re.match(r'v_(\w+)="(.+)"', line.strip())
-            if match:
-                qq_code = match.group(1)
-                data = match.group(2).split('~')
-                if len(data) >= 45:
-                    std_code = qq_code[2:]
-                    result[std_code] = {
-                        'name': data[1],
-                        'current': float(data[3]) if data[3] else 0,
-                        'prev_close': float(data[4]) if data[4] else 0,
-                        'open': float(data[5]) if data[5] else 0,
-                        'volume': float(data[6]) if data[6] else 0,
-                        'change': float(data[31]) if data[31] else 0,
-                        'change_pct': float(data[32]) if data[32] else 0,
-                        'high': float(data[33]) if data[33] else 0,
-                        'low': float(data[34]) if data[34] else 0,
-                    }
+            # 固定格式 v_<code>="<payload>"，直接切片，无需正则
+            if not line.startswith(b'v_') or not line.endswith(b'"'):
+                continue
+            eq = line.find(b'="')
+            if eq < 0:
+                continue
+            qq_code = line[2:eq].decode('ascii', errors='replace')
+            std_code = qq_code[2:]
+            # GBK 双字节的尾字节可能是 '~'，名称按其后的 ~代码~ 定界，而不是直接按 '~' 切分
+            head, _, rest = line[eq + 2:-1].partition(b'~')
+            name_end = rest.find(b'~' + std_code.encode('ascii') + b'~')
+            if name_end < 0:
+                continue
+            name = rest[:name_end].decode('gbk', errors='replace')
+            data = [head, name, *rest[name_end + 1:].split(b'~')]
+            if len(data) >= 45:
+                current, prev_close, open_, volume, change, change_pct, high, low = np.fromiter(
+                    (data[i] or b'0' for i in _QQ_FIELDS), dtype=np.float64, count=len(_QQ_FIELDS)
+                ).tolist()
+                result[std_code] = {
+                    'name': name,
+                    'current': current,
+                    'prev_close': prev_close,
+                    'open': open_,
+                    'volume': volume,
+                    'change': change,
+                    'change_pct': change_pct,
+                    'high': high,
+                    'low': low,
+                }
     except Exception as e:
         logger.warning(f"[大盘] 腾讯直连接口失败: {e}")
     
     return result
 
 
-@dataclass
+def _direction(change_pct: float) -> str:
+    """涨跌方向符号"""
+    return "↑" if change_pct > 0 else "↓" if change_pct < 0 else "-"
+
+
+def _news_items(news: List) -> List[Tuple[str, str]]:
+    """
+    把新闻归一化为 (标题[:50], 摘要[:100]) 列表
+
+    兼容 SearchResult 对象和字典
+    """
+    items = []
+    for n in news:
+        if hasattr(n, 'title'):
+            title, snippet = n.title, n.snippet
+        else:
+            title, snippet = n.get('title', ''), n.get('snippet', '')
+        items.append(((title or '')[:50], (snippet or '')[:100]))
+    return items
+
+
+@dataclass(slots=True)
 class MarketIndex:
     """大盘指数数据"""
     code: str                    # 指数代码
@@ -94,6 +257,39 @@ class MarketIndex:
     amount: float = 0.0          # 成交额（元）
     amplitude: float = 0.0       # 振幅(%)
     
+    @classmethod
+    def from_arrays(
+        cls,
+        codes: List[str],
+        names: List[str],
+        current: np.ndarray,
+        change: np.ndarray,
+        change_pct: np.ndarray,
+        opens: np.ndarray,
+        highs: np.ndarray,
+        lows: np.ndarray,
+        prev_close: np.ndarray,
+        volume: np.ndarray,
+        amount: np.ndarray,
+    ) -> List['MarketIndex']:
+        """
+        由按列存放的行情数组批量构造指数对象
+
+        振幅在数组上一次性计算（昨收 <= 0 时记为 0），
+        数值统一经 tolist() 转为 Python float
+        """
+        amplitude = np.divide(
+            (highs - lows) * 100,
+            prev_close,
+            out=np.zeros_like(prev_close, dtype=np.float64),
+            where=prev_close > 0,
+        )
+        columns = (current, change, change_pct, opens, highs, lows, prev_close, volume, amount, amplitude)
+        return [
+            cls(code, name, *row)
+            for code, name, *row in zip(codes, names, *(np.asarray(col, dtype=np.float64).tolist() for col in columns))
+        ]
+    
     def to_dict(self) -> Dict[str, Any]:
         return {
             'code': self.code,
@@ -110,7 +306,7 @@ class MarketIndex:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class MarketOverview:
     """市场概览数据"""
     date: str                           # 日期
@@ -149,6 +345,11 @@ class MarketAnalyzer:
         '000016': '上证50',
         '000300': '沪深300',
     }
+    _MAIN_INDICES_SET = frozenset(MAIN_INDICES)
+    
+    # 新浪数据源的代码带交易所前缀，需要映射
+    _SINA_CODE_MAP = _CODE_TO_QQ
+    _SINA_TO_CODE = {sina_code: code for code, sina_code in _SINA_CODE_MAP.items()}
     
     def __init__(self, search_service: Optional[SearchService] = None, analyzer=None):
         """
@@ -186,17 +387,28 @@ class MarketAnalyzer:
 
         overview = MarketOverview(date=formatted_date)
 
-        # 1. 获取主要指数行情
-        overview.indices = self._get_main_indices(target_date=target_date)
-
-        # 2. 获取涨跌统计
-        self._get_market_statistics(overview)
+        # 四类数据互不依赖且均为网络 I/O，并发获取；
+        # 各方法只写 overview 上各自的字段，互不重叠，无需加锁
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            # 1. 获取主要指数行情
+            indices_future = executor.submit(self._get_main_indices, target_date=target_date)
+            # 2. 获取涨跌统计 / 3. 获取板块涨跌榜 / 4. 获取北向资金（可选）
+            fillers = {
+                executor.submit(self._get_market_statistics, overview): "涨跌统计",
+                executor.submit(self._get_sector_rankings, overview): "板块涨跌榜",
+                executor.submit(self._get_north_flow, overview): "北向资金",
+            }
 
-        # 3. 获取板块涨跌榜
-        self._get_sector_rankings(overview)
+            try:
+                overview.indices = indices_future.result()
+            except Exception as e:
+                logger.error(f"[大盘] 获取指数行情失败: {e}")
 
-        # 4. 获取北向资金（可选）
-        self._get_north_flow(overview)
+            for future, label in fillers.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"[大盘] 获取{label}失败: {e}")
 
         return overview
     
@@ -218,53 +430,18 @@ class MarketAnalyzer:
                 logger.info(f"[大盘] 获取 {target_date} 的历史指数数据...")
                 # 标准化日期格式为 YYYYMMDD
                 date_str = target_date.replace('-', '')
-
-                for code, name in self.MAIN_INDICES.items():
-                    try:
-                        # 使用 akshare 获取指数历史数据
-                        df = ak.stock_zh_index_daily(symbol=f"sh{code}" if code.startswith('0') else f"sz{code}")
-
-                        if df is not None and not df.empty:
-                            # 查找指定日期的数据
-                            df['date'] = pd.to_datetime(df['date']).dt.strftime('%Y%m%d')
-                            target_row = df[df['date'] == date_str]
-
-                            if not target_row.empty:
-                                row = target_row.iloc[0]
-                                # 获取前一交易日数据用于计算涨跌
-                                row_idx = df[df['date'] == date_str].index[0]
-                                if row_idx > 0:
-                                    prev_row = df.iloc[row_idx - 1]
-                                    prev_close = float(prev_row.get('close', 0) or 0)
-                                else:
-                                    prev_close = float(row.get('close', 0) or 0)
-
-                                current_price = float(row.get('close', 0) or 0)
-                                change = current_price - prev_close
-                                change_pct = (change / prev_close * 100) if prev_close > 0 else 0
-
-                                index = MarketIndex(
-                                    code=code,
-                                    name=name,
-                                    current=current_price,
-                                    change=change,
-                                    change_pct=change_pct,
-                                    open=float(row.get('open', 0) or 0),
-                                    high=float(row.get('high', 0) or 0),
-                                    low=float(row.get('low', 0) or 0),
-                                    prev_close=prev_close,
-                                    volume=float(row.get('volume', 0) or 0),
-                                    amount=float(row.get('amount', 0) or 0),
-                                )
-                                # 计算振幅
-                                if index.prev_close > 0:
-                                    index.amplitude = (index.high - index.low) / index.prev_close * 100
-                                indices.append(index)
-                            else:
-                                logger.warning(f"[大盘] 未找到 {name}({code}) 在 {target_date} 的数据")
-                    except Exception as e:
-                        logger.warning(f"[大盘] 获取 {name}({code}) 历史数据失败: {e}")
-                        continue
+                # 目标日期只解析一次，各指数直接按 Timestamp 比较
+                target_ts = pd.Timestamp(f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}")
+
+                # 各指数历史数据互不依赖，并发获取后按 MAIN_INDICES 顺序输出
+                with ThreadPoolExecutor(max_workers=len(self.MAIN_INDICES)) as executor:
+                    results = executor.map(
+                        self._fetch_one_index_history,
+                        self.MAIN_INDICES.keys(),
+                        self.MAIN_INDICES.values(),
+                        repeat(target_ts),
+                    )
+                    indices.extend(index for index in results if index is not None)
 
             else:
                 # 获取实时数据
@@ -276,7 +453,7 @@ class MarketAnalyzer:
                 
                 # 尝试东方财富数据源
                 try:
-                    df = ak.stock_zh_index_spot_em()
+                    df = _spot_index_em(_minute_bucket())
                     if df is not None and not df.empty:
                         data_source = 'eastmoney'
                         logger.info("[大盘] 使用东方财富数据源获取指数行情")
@@ -286,7 +463,7 @@ class MarketAnalyzer:
                 # 回退到新浪数据源
                 if df is None or df.empty:
                     try:
-                        df = ak.stock_zh_index_spot_sina()
+                        df = _akshare().stock_zh_index_spot_sina()
                         if df is not None and not df.empty:
                             data_source = 'sina'
                             logger.info("[大盘] 使用新浪数据源获取指数行情")
@@ -320,72 +497,40 @@ class MarketAnalyzer:
                         return indices
 
                 if df is not None and not df.empty:
-                    # 新浪数据源的代码格式不同，需要映射
-                    sina_code_map = {
-                        '000001': 'sh000001',
-                        '399001': 'sz399001',
-                        '399006': 'sz399006',
-                        '000688': 'sh000688',
-                        '000016': 'sh000016',
-                        '000300': 'sh000300',
-                    }
-                    
-                    for code, name in self.MAIN_INDICES.items():
-                        row = None
-                        
-                        if data_source == 'eastmoney':
-                            # 东方财富格式
-                            row = df[df['代码'] == code]
-                            if row.empty:
-                                row = df[df['代码'].str.contains(code)]
-                        elif data_source == 'sina':
-                            # 新浪格式：代码带前缀如 sh000001
-                            sina_code = sina_code_map.get(code)
-                            if sina_code:
-                                row = df[df['代码'] == sina_code]
-
-                        if row is not None and not row.empty:
-                            row = row.iloc[0]
-                            
-                            index: Optional[MarketIndex] = None
-                            if data_source == 'eastmoney':
-                                index = MarketIndex(
-                                    code=code,
-                                    name=name,
-                                    current=float(row.get('最新价', 0) or 0),
-                                    change=float(row.get('涨跌额', 0) or 0),
-                                    change_pct=float(row.get('涨跌幅', 0) or 0),
-                                    open=float(row.get('今开', 0) or 0),
-                                    high=float(row.get('最高', 0) or 0),
-                                    low=float(row.get('最低', 0) or 0),
-                                    prev_close=float(row.get('昨收', 0) or 0),
-                                    volume=float(row.get('成交量', 0) or 0),
-                                    amount=float(row.get('成交额', 0) or 0),
-                                )
-                            elif data_source == 'sina':
-                                current = float(row.get('最新价', 0) or 0)
-                                prev_close = float(row.get('昨收', 0) or 0)
-                                change = current - prev_close if prev_close > 0 else 0
-                                change_pct = float(row.get('涨跌幅', 0) or 0)
-                                
-                                index = MarketIndex(
-                                    code=code,
-                                    name=name,
-                                    current=current,
-                                    change=change,
-                                    change_pct=change_pct,
-                                    open=float(row.get('今开', 0) or 0),
-                                    high=float(row.get('最高', 0) or 0),
-                                    low=float(row.get('最低', 0) or 0),
-                                    prev_close=prev_close,
-                                    volume=float(row.get('成交量', 0) or 0),
-                                    amount=float(row.get('成交额', 0) or 0),
-                                )
-                            
-                            if index is not None:
-                                if index.prev_close > 0:
-                                    index.amplitude = (index.high - index.low) / index.prev_close * 100
-                                indices.append(index)
+                    # 一次建立 指数代码 -> 行标签 映射，替代逐个指数的整表扫描
+                    code_to_label = {}
+                    if data_source == 'eastmoney':
+                        # 东方财富格式：兼容 sh/sz 前缀，精确代码优先
+                        for label, raw_code in zip(df.index, df['代码'].astype(str)):
+                            key = raw_code[2:] if raw_code[:2] in ('sh', 'sz') else raw_code
+                            if key in self._MAIN_INDICES_SET and (key == raw_code or key not in code_to_label):
+                                code_to_label[key] = label
+                    elif data_source == 'sina':
+                        # 新浪格式：代码带前缀如 sh000001，isin 一次筛出目标行
+                        sub = df[df['代码'].isin(self._SINA_TO_CODE)].drop_duplicates('代码')
+                        code_to_label = {
+                            self._SINA_TO_CODE[sina_code]: label
+                            for sina_code, label in zip(sub['代码'], sub.index)
+                        }
+
+                    # 先定位各指数所在行，再一次性把数值列转换为 float 矩阵
+                    matched = [  # [(code, name, 行标签)]
+                        (code, name, code_to_label[code])
+                        for code, name in self.MAIN_INDICES.items()
+                        if code in code_to_label
+                    ]
+
+                    if matched:
+                        values = _numeric_block(df.loc[[label for _, _, label in matched]], _SPOT_COLUMNS)
+                        current, change, change_pct, open_, high, low, prev_close, volume, amount = values.T
+                        if data_source == 'sina':
+                            # 新浪数据源的涨跌额按 最新价 - 昨收 计算
+                            change = np.where(prev_close > 0, current - prev_close, 0.0)
+                        indices.extend(MarketIndex.from_arrays(
+                            [code for code, _, _ in matched],
+                            [name for _, name, _ in matched],
+                            current, change, change_pct, open_, high, low, prev_close, volume, amount,
+                        ))
 
             logger.info(f"[大盘] 获取到 {len(indices)} 个指数行情")
 
@@ -394,6 +539,61 @@ class MarketAnalyzer:
 
         return indices
     
+    def _fetch_one_index_history(self, code: str, name: str, target_ts: pd.Timestamp) -> Optional[MarketIndex]:
+        """
+        获取单个指数在指定日期的历史行情
+
+        Args:
+            code: 指数代码
+            name: 指数名称
+            target_ts: 目标日期
+
+        Returns:
+            MarketIndex，未找到或获取失败时返回 None
+        """
+        try:
+            # 使用 akshare 获取指数历史数据
+            df = _akshare().stock_zh_index_daily(symbol=f"sh{code}" if code.startswith('0') else f"sz{code}")
+
+            if df is not None and not df.empty:
+                # 查找指定日期的数据：日期列按时间升序，二分定位，不再逐行格式化为字符串
+                dates = pd.to_datetime(df['date'])
+                pos = int(dates.searchsorted(target_ts))
+
+                if pos < len(dates) and dates.iloc[pos] == target_ts:
+                    # 按整数位置一次取出前一交易日与当日的数值列（首个交易日以当日收盘作为昨收）
+                    prev_pos = pos - 1 if pos > 0 else pos
+                    prev_values, values = _numeric_block(df.iloc[[prev_pos, pos]], _HISTORY_COLUMNS).tolist()
+                    prev_close = prev_values[3]
+                    open_, high, low, current_price, volume, amount = values
+
+                    change = current_price - prev_close
+                    change_pct = (change / prev_close * 100) if prev_close > 0 else 0
+
+                    index = MarketIndex(
+                        code=code,
+                        name=name,
+                        current=current_price,
+                        change=change,
+                        change_pct=change_pct,
+                        open=open_,
+                        high=high,
+                        low=low,
+                        prev_close=prev_close,
+                        volume=volume,
+                        amount=amount,
+                    )
+                    # 计算振幅
+                    if index.prev_close > 0:
+                        index.amplitude = (index.high - index.low) / index.prev_close * 100
+                    return index
+
+            logger.warning(f"[大盘] 未找到 {name}({code}) 在 {target_ts:%Y%m%d} 的数据")
+        except Exception as e:
+            logger.warning(f"[大盘] 获取 {name}({code}) 历史数据失败: {e}")
+
+        return None
+    
     def _get_market_statistics(self, overview: MarketOverview):
         """获取市场涨跌统计"""
         try:
@@ -402,7 +602,7 @@ class MarketAnalyzer:
             df = None
             
             try:
-                df = ak.stock_zh_a_spot_em()
+                df = _spot_a_em(_minute_bucket())
                 if df is not None and not df.empty:
                     logger.info("[大盘] 使用东方财富数据源获取涨跌统计")
             except Exception as e:
@@ -410,7 +610,7 @@ class MarketAnalyzer:
             
             if df is None or df.empty:
                 try:
-                    df = ak.stock_zh_a_spot()
+                    df = _akshare().stock_zh_a_spot()
                     if df is not None and not df.empty:
                         logger.info("[大盘] 使用腾讯数据源获取涨跌统计")
                 except Exception as e:
@@ -418,19 +618,32 @@ class MarketAnalyzer:
             
             if df is not None and not df.empty:
                 change_col = '涨跌幅'
-                if change_col in df.columns:
-                    df[change_col] = pd.to_numeric(df[change_col], errors='coerce')
-                    overview.up_count = len(df[df[change_col] > 0])
-                    overview.down_count = len(df[df[change_col] < 0])
-                    overview.flat_count = len(df[df[change_col] == 0])
-                    
-                    overview.limit_up_count = len(df[df[change_col] >= 9.9])
-                    overview.limit_down_count = len(df[df[change_col] <= -9.9])
-                
                 amount_col = '成交额'
-                if amount_col in df.columns:
-                    df[amount_col] = pd.to_numeric(df[amount_col], errors='coerce')
-                    overview.total_amount = df[amount_col].sum() / 1e8
+                n = len(df)
+                change_pct = (
+                    pd.to_numeric(df[change_col], errors='coerce').to_numpy(dtype=np.float64)
+                    if change_col in df.columns else np.full(n, np.nan)
+                )
+                amount = (
+                    pd.to_numeric(df[amount_col], errors='coerce').to_numpy(dtype=np.float64)
+                    if amount_col in df.columns else np.zeros(n)
+                )
+                if NUMBA_AVAILABLE:
+                    # 编译内核单次遍历完成全部计数与成交额求和
+                    up, down, flat, limit_up, limit_down, total_amount = _compute_stats(change_pct, amount)
+                else:
+                    up = (change_pct > 0).sum()
+                    down = (change_pct < 0).sum()
+                    flat = (change_pct == 0).sum()
+                    limit_up = (change_pct >= 9.9).sum()
+                    limit_down = (change_pct <= -9.9).sum()
+                    total_amount = np.nansum(amount)
+                overview.up_count = int(up)
+                overview.down_count = int(down)
+                overview.flat_count = int(flat)
+                overview.limit_up_count = int(limit_up)
+                overview.limit_down_count = int(limit_down)
+                overview.total_amount = float(total_amount) / 1e8
                 
                 logger.info(f"[大盘] 涨:{overview.up_count} 跌:{overview.down_count} 平:{overview.flat_count} "
                           f"涨停:{overview.limit_up_count} 跌停:{overview.limit_down_count} "
@@ -448,7 +661,7 @@ class MarketAnalyzer:
             name_col = '板块名称'
             
             try:
-                df = ak.stock_board_industry_name_em()
+                df = _board_industry_em(_minute_bucket())
                 if df is not None and not df.empty:
                     logger.info("[大盘] 使用东方财富数据源获取板块行情")
             except Exception as e:
@@ -456,7 +669,7 @@ class MarketAnalyzer:
             
             if df is None or df.empty:
                 try:
-                    df = ak.stock_board_concept_name_em()
+                    df = _akshare().stock_board_concept_name_em()
                     name_col = '板块名称'
                     if df is not None and not df.empty:
                         logger.info("[大盘] 使用东方财富概念板块数据源")
@@ -466,19 +679,24 @@ class MarketAnalyzer:
             if df is not None and not df.empty:
                 change_col = '涨跌幅'
                 if change_col in df.columns and name_col in df.columns:
-                    df[change_col] = pd.to_numeric(df[change_col], errors='coerce')
+                    # 快照为缓存共享对象，使用 assign 生成新表而非原地修改
+                    df = df.assign(**{change_col: pd.to_numeric(df[change_col], errors='coerce')})
                     df = df.dropna(subset=[change_col])
                     
-                    top = df.nlargest(5, change_col)
+                    # argpartition 为 O(N) 选取，只对选出的 5 个排序
+                    vals = df[change_col].to_numpy(dtype=np.float64)
+                    names = df[name_col].to_numpy()
+                    
+                    top_idx = _top_k_positions(-vals, 5)
                     overview.top_sectors = [
-                        {'name': row[name_col], 'change_pct': row[change_col]}
-                        for _, row in top.iterrows()
+                        {'name': n, 'change_pct': float(p)}
+                        for n, p in zip(names[top_idx], vals[top_idx])
                     ]
                     
-                    bottom = df.nsmallest(5, change_col)
+                    bottom_idx = _top_k_positions(vals, 5)
                     overview.bottom_sectors = [
-                        {'name': row[name_col], 'change_pct': row[change_col]}
-                        for _, row in bottom.iterrows()
+                        {'name': n, 'change_pct': float(p)}
+                        for n, p in zip(names[bottom_idx], vals[bottom_idx])
                     ]
                     
                     logger.info(f"[大盘] 领涨板块: {[s['name'] for s in overview.top_sectors]}")
@@ -492,25 +710,9 @@ class MarketAnalyzer:
         try:
             logger.info("[大盘] 获取北向资金...")
             
-            north_flow_total = 0.0
-            
-            for symbol in ['沪股通', '深股通']:
-                try:
-                    df = ak.stock_hsgt_hist_em(symbol=symbol)
-                    if df is not None and not df.empty:
-                        latest = df.iloc[-1]
-                        flow_col = None
-                        for col in ['当日资金流入', '当日净流入', '净流入']:
-                            if col in df.columns:
-                                flow_col = col
-                                break
-                        if flow_col:
-                            flow_value = latest.get(flow_col, 0)
-                            if pd.notna(flow_value):
-                                north_flow_total += float(flow_value)
-                except Exception as e:
-                    logger.debug(f"[大盘] 获取 {symbol} 数据失败: {e}")
-                    continue
+            # 沪股通、深股通两个查询互不依赖，并发获取
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                north_flow_total = sum(executor.map(self._fetch_hsgt, ['沪股通', '深股通']))
             
             if north_flow_total != 0:
                 overview.north_flow = north_flow_total / 1e8
@@ -521,6 +723,31 @@ class MarketAnalyzer:
         except Exception as e:
             logger.warning(f"[大盘] 获取北向资金失败: {e}")
     
+    @staticmethod
+    def _fetch_hsgt(symbol: str) -> float:
+        """
+        获取单个通道（沪股通/深股通）最新一日的资金净流入
+
+        Args:
+            symbol: '沪股通' 或 '深股通'
+
+        Returns:
+            净流入金额（元），获取失败返回 0.0
+        """
+        try:
+            df = _akshare().stock_hsgt_hist_em(symbol=symbol)
+            if df is not None and not df.empty:
+                latest = df.iloc[-1]
+                for col in ['当日资金流入', '当日净流入', '净流入']:
+                    if col in df.columns:
+                        flow_value = latest.get(col, 0)
+                        if pd.notna(flow_value):
+                            return float(flow_value)
+                        break
+        except Exception as e:
+            logger.debug(f"[大盘] 获取 {symbol} 数据失败: {e}")
+        return 0.0
+    
     def search_market_news(self) -> List[Dict]:
         """
         搜索市场新闻
@@ -543,20 +770,31 @@ class MarketAnalyzer:
             f"A股 市场 热点 板块 {month_str}",
         ]
         
-        try:
-            logger.info("[大盘] 开始搜索市场新闻...")
-            
-            for query in search_queries:
-                # 使用 search_stock_news 方法，传入"大盘"作为股票名
+        def _search(query: str) -> List:
+            # 使用 search_stock_news 方法，传入"大盘"作为股票名
+            try:
                 response = self.search_service.search_stock_news(
                     stock_code="market",
                     stock_name="大盘",
                     max_results=3,
                     focus_keywords=query.split()
                 )
-                if response and response.results:
-                    all_news.extend(response.results)
-                    logger.info(f"[大盘] 搜索 '{query}' 获取 {len(response.results)} 条结果")
+            except Exception as e:
+                logger.warning(f"[大盘] 搜索 '{query}' 失败: {e}")
+                return []
+            return (response.results or []) if response else []
+        
+        try:
+            logger.info("[大盘] 开始搜索市场新闻...")
+            
+            # 三个查询并发执行，结果按查询顺序合并
+            with ThreadPoolExecutor(max_workers=len(search_queries)) as executor:
+                results = list(executor.map(_search, search_queries))
+            
+            for query, news in zip(search_queries, results):
+                if news:
+                    all_news.extend(news)
+                    logger.info(f"[大盘] 搜索 '{query}' 获取 {len(news)} 条结果")
             
             logger.info(f"[大盘] 共获取 {len(all_news)} 条市场新闻")
             
@@ -617,26 +855,20 @@ class MarketAnalyzer:
     def _build_review_prompt(self, overview: MarketOverview, news: List) -> str:
         """构建复盘报告 Prompt"""
         # 指数行情信息（简洁格式，不用emoji）
-        indices_text = ""
-        for idx in overview.indices:
-            direction = "↑" if idx.change_pct > 0 else "↓" if idx.change_pct < 0 else "-"
-            indices_text += f"- {idx.name}: {idx.current:.2f} ({direction}{abs(idx.change_pct):.2f}%)\n"
+        indices_text = "".join(
+            f"- {idx.name}: {idx.current:.2f} ({_direction(idx.change_pct)}{abs(idx.change_pct):.2f}%)\n"
+            for idx in overview.indices
+        )
         
         # 板块信息
         top_sectors_text = ", ".join([f"{s['name']}({s['change_pct']:+.2f}%)" for s in overview.top_sectors[:3]])
         bottom_sectors_text = ", ".join([f"{s['name']}({s['change_pct']:+.2f}%)" for s in overview.bottom_sectors[:3]])
         
-        # 新闻信息 - 支持 SearchResult 对象或字典
-        news_text = ""
-        for i, n in enumerate(news[:6], 1):
-            # 兼容 SearchResult 对象和字典
-            if hasattr(n, 'title'):
-                title = n.title[:50] if n.title else ''
-                snippet = n.snippet[:100] if n.snippet else ''
-            else:
-                title = n.get('title', '')[:50]
-                snippet = n.get('snippet', '')[:100]
-            news_text += f"{i}. {title}\n   {snippet}\n"
+        # 新闻信息 - 先统一归一化为 (标题, 摘要)，再一次性拼接
+        news_text = "".join(
+            f"{i}. {title}\n   {snippet}\n"
+            for i, (title, snippet) in enumerate(_news_items(news[:6]), 1)
+        )
         
         prompt = f"""你是一位专业的A股市场分析师，请根据以下数据生成一份简洁的大盘复盘报告。
 
@@ -717,10 +949,10 @@ class MarketAnalyzer:
             market_mood = "震荡整理"
         
         # 指数行情（简洁格式）
-        indices_text = ""
-        for idx in overview.indices[:4]:
-            direction = "↑" if idx.change_pct > 0 else "↓" if idx.change_pct < 0 else "-"
-            indices_text += f"- **{idx.name}**: {idx.current:.2f} ({direction}{abs(idx.change_pct):.2f}%)\n"
+        indices_text = "".join(
+            f"- **{idx.name}**: {idx.current:.2f} ({_direction(idx.change_pct)}{abs(idx.change_pct):.2f}%)\n"
+            for idx in overview.indices[:4]
+        )
         
         # 板块信息
         top_text = "、".join([s['name'] for s in overview.top_sectors[:3]])
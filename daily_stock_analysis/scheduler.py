@@ -23,17 +23,24 @@ from typing import Callable, Optional
 
 logger = logging.getLogger(__name__)
 
+# 心跳日志间隔（秒），也是主循环单次等待的上限
+HEARTBEAT_INTERVAL = 3600
+
 
 class GracefulShutdown:
     """
     优雅退出处理器
     
     捕获 SIGTERM/SIGINT 信号，确保任务完成后再退出
+    
+    退出请求通过 threading.Event 传递，主循环阻塞在 wait() 上，
+    收到信号立即唤醒，无需周期性轮询
     """
     
     def __init__(self):
         self.shutdown_requested = False
         self._lock = threading.Lock()
+        self.stop_event = threading.Event()
         
         # 注册信号处理器
         signal.signal(signal.SIGINT, self._signal_handler)
@@ -45,12 +52,30 @@ class GracefulShutdown:
             if not self.shutdown_requested:
                 logger.info(f"收到退出信号 ({signum})，等待当前任务完成...")
                 self.shutdown_requested = True
+        self.stop_event.set()
     
     @property
     def should_shutdown(self) -> bool:
         """检查是否应该退出"""
         with self._lock:
             return self.shutdown_requested
+    
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        阻塞等待退出信号
+        
+        Args:
+            timeout: 最长等待秒数（None 表示一直等待）
+            
+        Returns:
+            是否已收到退出信号
+        """
+        try:
+            return self.stop_event.wait(timeout)
+        except KeyboardInterrupt:
+            # Windows 下 Event.wait() 可能直接抛出 KeyboardInterrupt
+            self._signal_handler(signal.SIGINT, None)
+            return True
 
 
 class Scheduler:
@@ -121,7 +146,8 @@ class Scheduler:
         """
         运行调度器主循环
         
-        阻塞运行，直到收到退出信号
+        阻塞运行，直到收到退出信号。每轮直接等待到下一个任务的触发时间
+        （schedule.idle_seconds()），最长等待 1 小时以输出心跳，不再按固定间隔轮询
         """
         self._running = True
         logger.info("调度器开始运行...")
@@ -129,10 +155,14 @@ class Scheduler:
         
         while self._running and not self.shutdown_handler.should_shutdown:
             self.schedule.run_pending()
-            time.sleep(30)  # 每30秒检查一次
             
-            # 每小时打印一次心跳
-            if datetime.now().minute == 0 and datetime.now().second < 30:
+            idle = self.schedule.idle_seconds()
+            timeout = HEARTBEAT_INTERVAL if idle is None else min(max(idle, 0), HEARTBEAT_INTERVAL)
+            if self.shutdown_handler.wait(timeout):  # 收到信号立即退出
+                break
+            
+            # 未到执行时间而被心跳间隔唤醒时打印心跳
+            if idle is None or idle > HEARTBEAT_INTERVAL:
                 logger.info(f"调度器运行中... 下次执行: {self._get_next_run_time()}")
         
         logger.info("调度器已停止")
@@ -148,6 +178,7 @@ class Scheduler:
     def stop(self):
         """停止调度器"""
         self._running = False
+        self.shutdown_handler.stop_event.set()
 
 
 def run_with_schedule(
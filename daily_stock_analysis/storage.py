@@ -13,42 +13,169 @@ A股自选股智能分析系统 - 存储层
 
 import atexit
 import logging
-import json
 from datetime import datetime, date, timedelta
-from typing import Optional, List, Dict, Any
+from functools import lru_cache
+from typing import Optional, List, Dict, Any, Iterator, Set, Tuple
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import (
     create_engine,
     Column,
     String,
     Float,
+    BigInteger,
     Date,
     DateTime,
     Integer,
     Text,
     Boolean,
     Index,
+    MetaData,
+    Table,
     UniqueConstraint,
     select,
     and_,
+    bindparam,
     desc,
+    event,
+    func,
+    inspect,
+    literal,
 )
 from sqlalchemy.orm import (
+    aliased,
     declarative_base,
     sessionmaker,
     Session,
 )
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from daily_stock_analysis.config import get_config
+from daily_stock_analysis.json_io import dumps as json_dumps, loads as json_loads
 
 logger = logging.getLogger(__name__)
 
 # SQLAlchemy ORM 基类
 Base = declarative_base()
 
+def _json_text(obj: Any) -> str:
+    """序列化为 JSON 字符串（写入 Text 列）"""
+    return json_dumps(obj).decode('utf-8')
+
+
+# 历史版本创建、已不再声明的索引：_ensure_schema 在旧库上删除，避免拖慢写入
+# - ix_code_date / ix_code_date_desc 与 uix_code_date 重复
+# - 单列日期索引已被 ix_date_code / ix_analysis_date_code 覆盖
+_RETIRED_INDEXES = {
+    'stock_daily': ('ix_code_date', 'ix_code_date_desc', 'ix_stock_daily_date'),
+    'stock_analysis_result': ('ix_stock_analysis_result_analysis_date',),
+}
+
+# SQLite 连接参数：WAL 允许读写并发，synchronous=NORMAL 在 WAL 下只在检查点 fsync
+_SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",  # 256MB
+    "PRAGMA cache_size=-65536",  # 64MB（负数单位为 KiB）
+)
+
+
+def _to_int_column(series: pd.Series) -> pd.Series:
+    """数值列四舍五入为 Python int，缺失值为 None"""
+    values = pd.to_numeric(series, errors='coerce').round().astype('Int64')
+    return values.astype(object).where(values.notna(), None)
+
+
+@lru_cache(maxsize=1)
+def _default_db_url() -> str:
+    """默认数据库 URL（读取配置并创建目录，进程内只执行一次）"""
+    return get_config().get_db_url()
+
+
+# 连接池参数：并发分析时多线程同时读写，默认 5 + 10 个连接容易在 QueuePool 上排队
+DB_POOL_SIZE = 20
+DB_MAX_OVERFLOW = 40
+DB_POOL_RECYCLE = 3600  # 秒
+
+
+def _daily_values(record: Dict[str, Any]) -> Tuple:
+    """写库记录的数值列元组（用于判断内容是否变化）"""
+    return tuple(record[col] for col in _DAILY_VALUE_COLUMNS)
+
+
+def _engine_pool_options(db_url: str) -> Dict[str, Any]:
+    """
+    按数据库类型生成 create_engine 的连接池参数
+    
+    - SQLite 文件库：连接可跨线程复用（check_same_thread=False），配合 WAL 支持并发读写
+    - SQLite 内存库：使用 SQLAlchemy 默认的单连接池，不设置池大小
+    """
+    url = make_url(db_url)
+    options: Dict[str, Any] = {}
+    if url.get_backend_name() == 'sqlite':
+        options['connect_args'] = {'check_same_thread': False}
+        if url.database in (None, '', ':memory:'):
+            return options
+    options.update(
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_recycle=DB_POOL_RECYCLE,
+    )
+    return options
+
+
+def _daily_records(df: pd.DataFrame, code: str, data_source: str) -> List[Dict[str, Any]]:
+    """
+    把日线 DataFrame 按列一次性转换为写库用的字典列表
+    
+    缺失列、NaN 均转为 None，数值为 Python 原生类型（不逐行经过 Series.get）
+    
+    Args:
+        df: 包含日线数据的 DataFrame（date 列已转换为 date 对象）
+        code: 股票代码
+        data_source: 数据来源名称
+    """
+    values = df.reindex(columns=_DAILY_VALUE_COLUMNS)
+    values = values.astype(object).where(values.notna(), None)
+    records = values.to_dict(orient='records')
+    for record, row_date in zip(records, df['date'].tolist()):
+        record['code'] = code
+        record['date'] = row_date
+        record['data_source'] = data_source
+    return records
+
+
+def _set_sqlite_pragmas(dbapi_conn, connection_record) -> None:
+    """SQLite 新建连接时设置 PRAGMA（engine connect 事件）"""
+    cursor = dbapi_conn.cursor()
+    try:
+        for pragma in _SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
+
+# 支持 INSERT ... ON CONFLICT DO UPDATE 的方言
+_UPSERT_INSERTS = {
+    'sqlite': sqlite_insert,
+    'postgresql': pg_insert,
+}
+
+# 以整数存储的列（成交量、成交额）
+_DAILY_INTEGER_COLUMNS = ('volume', 'amount')
+
+# 日线行情写入/更新的数值列（与 DataFrame 列名一致）
+_DAILY_VALUE_COLUMNS = [
+    'open', 'high', 'low', 'close', 'volume', 'amount',
+    'pct_chg', 'ma5', 'ma10', 'ma20', 'volume_ratio',
+]
+
 
 # === 数据模型定义 ===
 
@@ -67,8 +194,8 @@ class StockDaily(Base):
     # 股票代码（如 600519, 000001）
     code = Column(String(10), nullable=False, index=True)
     
-    # 交易日期
-    date = Column(Date, nullable=False, index=True)
+    # 交易日期（按日期的查询由 ix_date_code 覆盖）
+    date = Column(Date, nullable=False)
     
     # OHLC 数据
     open = Column(Float)
@@ -76,9 +203,9 @@ class StockDaily(Base):
     low = Column(Float)
     close = Column(Float)
     
-    # 成交数据
-    volume = Column(Float)  # 成交量（股）
-    amount = Column(Float)  # 成交额（元）
+    # 成交数据（整数存储，SQLite 按值大小变长编码，比 8 字节 REAL 更省空间）
+    volume = Column(BigInteger)  # 成交量（股）
+    amount = Column(BigInteger)  # 成交额（元）
     pct_chg = Column(Float)  # 涨跌幅（%）
     
     # 技术指标
@@ -96,8 +223,9 @@ class StockDaily(Base):
     
     # 唯一约束：同一股票同一日期只能有一条数据
     __table_args__ = (
+        # uix_code_date 同时服务 get_latest_data 的按代码倒序取最近 N 天（反向扫描）
         UniqueConstraint('code', 'date', name='uix_code_date'),
-        Index('ix_code_date', 'code', 'date'),
+        Index('ix_date_code', 'date', 'code'),  # 按日期的全市场扫描
     )
     
     def __repr__(self):
@@ -133,7 +261,7 @@ class StockAnalysisResult(Base):
     # 股票信息
     code = Column(String(10), nullable=False, index=True)
     name = Column(String(50), nullable=False)
-    analysis_date = Column(Date, nullable=False, index=True)
+    analysis_date = Column(Date, nullable=False)
     
     # 核心指标（独立字段，便于查询）
     sentiment_score = Column(Integer)  # 0-100
@@ -162,6 +290,7 @@ class StockAnalysisResult(Base):
     __table_args__ = (
         UniqueConstraint('code', 'analysis_date', name='uix_analysis_code_date'),
         Index('ix_analysis_code_date', 'code', 'analysis_date'),
+        Index('ix_analysis_date_code', 'analysis_date', 'code'),  # 按日期的批量查询
         Index('ix_analysis_score', 'sentiment_score'),
     )
     
@@ -178,7 +307,6 @@ class StockAnalysisResult(Base):
             'trend_prediction': self.trend_prediction,
             'operation_advice': self.operation_advice,
             'confidence_level': self.confidence_level,
-            'dashboard': json.loads(self.dashboard) if self.dashboard else None,
             'trend_analysis': self.trend_analysis,
             'technical_analysis': self.technical_analysis,
             'fundamental_analysis': self.fundamental_analysis,
@@ -188,6 +316,7 @@ class StockAnalysisResult(Base):
             'risk_warning': self.risk_warning,
             'search_performed': self.search_performed,
             'data_sources': self.data_sources,
+            'dashboard': json_loads(self.dashboard) if self.dashboard else None,
         }
 
 
@@ -233,12 +362,32 @@ class MarketOverviewModel(Base):
             'limit_down_count': self.limit_down_count,
             'total_amount': self.total_amount,
             'north_flow': self.north_flow,
-            'indices': json.loads(self.indices) if self.indices else [],
-            'top_sectors': json.loads(self.top_sectors) if self.top_sectors else [],
-            'bottom_sectors': json.loads(self.bottom_sectors) if self.bottom_sectors else [],
+            'indices': json_loads(self.indices) if self.indices else [],
+            'top_sectors': json_loads(self.top_sectors) if self.top_sectors else [],
+            'bottom_sectors': json_loads(self.bottom_sectors) if self.bottom_sectors else [],
         }
 
 
+# 高频查询语句：模块加载时构造一次，调用时只传绑定参数，
+# 省去每次重建语句对象与计算缓存键的开销（编译结果由 SQLAlchemy 语句缓存复用）
+_HAS_DAILY_STMT = (
+    select(literal(1))
+    .where(
+        and_(
+            StockDaily.code == bindparam('code'),
+            StockDaily.date == bindparam('target_date')
+        )
+    )
+    .limit(1)
+)
+_LATEST_DAILY_STMT = (
+    select(StockDaily)
+    .where(StockDaily.code == bindparam('code'))
+    .order_by(desc(StockDaily.date))
+    .limit(bindparam('days'))
+)
+
+
 class DatabaseManager:
     """
     数据库管理器 - 单例模式
@@ -269,16 +418,23 @@ class DatabaseManager:
             return
         
         if db_url is None:
-            config = get_config()
-            db_url = config.get_db_url()
+            db_url = _default_db_url()
         
         # 创建数据库引擎
         self._engine = create_engine(
             db_url,
             echo=False,  # 设为 True 可查看 SQL 语句
             pool_pre_ping=True,  # 连接健康检查
+            **_engine_pool_options(db_url),
         )
         
+        if self._engine.dialect.name == 'sqlite':
+            event.listen(self._engine, 'connect', _set_sqlite_pragmas)
+        
+        # has_today_data 命中缓存：只记录已确认存在的 (股票代码, 日期)，
+        # 未命中的结果不缓存，避免盘中稍后入库的数据被永久判定为缺失
+        self._today_cache: Set[Tuple[str, date]] = set()
+        
         # 创建 Session 工厂
         self._SessionLocal = sessionmaker(
             bind=self._engine,
@@ -286,8 +442,8 @@ class DatabaseManager:
             autoflush=False,
         )
         
-        # 创建所有表
-        Base.metadata.create_all(self._engine)
+        # 创建表结构：只在有表缺失时执行 DDL，已初始化的数据库跳过
+        self._ensure_schema()
 
         self._initialized = True
         logger.info(f"数据库初始化完成: {db_url}")
@@ -295,6 +451,36 @@ class DatabaseManager:
         # 注册退出钩子，确保程序退出时关闭数据库连接
         atexit.register(DatabaseManager._cleanup_engine, self._engine)
     
+    def _ensure_schema(self) -> None:
+        """
+        确保表和索引存在
+        
+        一次反射取得已有表名，缺表时才调用 create_all；
+        已存在的表不会被 create_all 补建新增索引，这里按已有索引名补齐，
+        并删除 _RETIRED_INDEXES 中列出的旧索引
+        """
+        inspector = inspect(self._engine)
+        existing_tables = set(inspector.get_table_names())
+        if not existing_tables.issuperset(Base.metadata.tables):
+            Base.metadata.create_all(self._engine)
+        
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue  # 刚由 create_all 创建，索引已齐全
+            existing_indexes = {index['name'] for index in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    index.create(self._engine)
+            
+            retired = existing_indexes.intersection(_RETIRED_INDEXES.get(table.name, ()))
+            if retired:
+                # 反射到独立的 MetaData 上取得可 DROP 的索引对象，不影响模型定义
+                reflected = Table(table.name, MetaData(), autoload_with=self._engine)
+                for index in reflected.indexes:
+                    if index.name in retired:
+                        index.drop(self._engine)
+                        logger.info(f"已删除废弃索引: {table.name}.{index.name}")
+    
     @classmethod
     def get_instance(cls) -> 'DatabaseManager':
         """获取单例实例"""
@@ -358,17 +544,24 @@ class DatabaseManager:
         if target_date is None:
             target_date = date.today()
         
+        key = (code, target_date)
+        if key in self._today_cache:
+            return True
+        
         with self.get_session() as session:
+            # 只探测索引是否命中，不加载 ORM 对象
             result = session.execute(
-                select(StockDaily).where(
-                    and_(
-                        StockDaily.code == code,
-                        StockDaily.date == target_date
-                    )
-                )
-            ).scalar_one_or_none()
-            
-            return result is not None
+                _HAS_DAILY_STMT, {'code': code, 'target_date': target_date}
+            ).first()
+        
+        exists = result is not None
+        if exists:
+            self._today_cache.add(key)
+        return exists
+    
+    def _mark_saved_dates(self, code: str, row_dates) -> None:
+        """保存成功后把对应 (代码, 日期) 标记为已存在"""
+        self._today_cache.update((code, row_date) for row_date in row_dates)
     
     def get_latest_data(
         self, 
@@ -389,14 +582,55 @@ class DatabaseManager:
         """
         with self.get_session() as session:
             results = session.execute(
-                select(StockDaily)
-                .where(StockDaily.code == code)
-                .order_by(desc(StockDaily.date))
-                .limit(days)
+                _LATEST_DAILY_STMT, {'code': code, 'days': days}
             ).scalars().all()
             
             return list(results)
     
+    def get_latest_data_bulk(
+        self,
+        codes: List[str],
+        days: int = 2
+    ) -> Dict[str, List[StockDaily]]:
+        """
+        批量获取多只股票最近 N 天的数据
+        
+        使用 ROW_NUMBER() OVER (PARTITION BY code ORDER BY date DESC) 窗口函数，
+        一条查询取回全部股票，替代逐只调用 get_latest_data
+        
+        Args:
+            codes: 股票代码列表
+            days: 每只股票获取天数
+            
+        Returns:
+            {股票代码: StockDaily 对象列表（按日期降序）}，无数据的代码对应空列表
+        """
+        result: Dict[str, List[StockDaily]] = {code: [] for code in codes}
+        if not codes:
+            return result
+        
+        row_num = func.row_number().over(
+            partition_by=StockDaily.code,
+            order_by=desc(StockDaily.date),
+        ).label('rn')
+        ranked = (
+            select(StockDaily, row_num)
+            .where(StockDaily.code.in_(codes))
+            .subquery()
+        )
+        ranked_daily = aliased(StockDaily, ranked)
+        
+        with self.get_session() as session:
+            rows = session.execute(
+                select(ranked_daily)
+                .where(ranked.c.rn <= days)
+                .order_by(ranked.c.code, ranked.c.rn)
+            ).scalars().all()
+        
+        for row in rows:
+            result[row.code].append(row)
+        return result
+    
     def get_data_range(
         self, 
         code: str, 
@@ -412,10 +646,34 @@ class DatabaseManager:
             end_date: 结束日期
             
         Returns:
-            StockDaily 对象列表
+            StockDaily 对象列表（按日期升序）
+        """
+        return list(self.get_data_range_iter(code, start_date, end_date))
+    
+    def get_data_range_iter(
+        self,
+        code: str,
+        start_date: date,
+        end_date: date,
+        batch_size: int = 1000
+    ) -> Iterator[StockDaily]:
+        """
+        流式获取指定日期范围的数据（get_data_range 基于此实现）
+        
+        按 batch_size 分批从游标取行，内存占用与范围长度无关，
+        适合只需遍历一次的聚合计算。迭代结束（或生成器关闭）时释放 Session
+        
+        Args:
+            code: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+            batch_size: 每批加载的行数
+            
+        Yields:
+            StockDaily 对象（按日期升序）
         """
         with self.get_session() as session:
-            results = session.execute(
+            yield from session.execute(
                 select(StockDaily)
                 .where(
                     and_(
@@ -425,9 +683,8 @@ class DatabaseManager:
                     )
                 )
                 .order_by(StockDaily.date)
-            ).scalars().all()
-            
-            return list(results)
+                .execution_options(yield_per=batch_size)
+            ).scalars()
     
     def save_daily_data(
         self, 
@@ -440,7 +697,7 @@ class DatabaseManager:
         
         策略：
         - 使用 UPSERT 逻辑（存在则更新，不存在则插入）
-        - 跳过已存在的数据，避免重复
+        - SQLite / PostgreSQL 使用 ON CONFLICT 批量写入，其他数据库逐行处理
         
         Args:
             df: 包含日线数据的 DataFrame
@@ -454,67 +711,136 @@ class DatabaseManager:
             logger.warning(f"保存数据为空，跳过 {code}")
             return 0
         
-        saved_count = 0
+        # 整列一次性解析日期，替代逐行的类型判断与 strptime；成交量/成交额取整
+        df = df.assign(
+            date=pd.to_datetime(df['date']).dt.date,
+            **{
+                col: _to_int_column(df[col])
+                for col in _DAILY_INTEGER_COLUMNS if col in df.columns
+            },
+        )
+        
+        # 整批记录共用同一时间戳，不再逐行调用 datetime.now()
+        batch_now = datetime.now()
+        
+        upsert_insert = _UPSERT_INSERTS.get(self._engine.dialect.name)
+        if upsert_insert is not None:
+            return self._upsert_daily_data(upsert_insert, df, code, data_source, batch_now)
+        
+        to_insert: List[Dict[str, Any]] = []
+        to_update: List[Dict[str, Any]] = []
         
         with self.get_session() as session:
             try:
-                for _, row in df.iterrows():
-                    # 解析日期
-                    row_date = row.get('date')
-                    if isinstance(row_date, str):
-                        row_date = datetime.strptime(row_date, '%Y-%m-%d').date()
-                    elif isinstance(row_date, datetime):
-                        row_date = row_date.date()
-                    elif isinstance(row_date, pd.Timestamp):
-                        row_date = row_date.date()
-                    
-                    # 检查是否已存在
-                    existing = session.execute(
-                        select(StockDaily).where(
-                            and_(
-                                StockDaily.code == code,
-                                StockDaily.date == row_date
-                            )
-                        )
-                    ).scalar_one_or_none()
+                # 一次查询取得已有记录，不再逐行 SELECT
+                existing = self._load_existing_daily(session, code, df['date'])
+                
+                for record in _daily_records(df, code, data_source):
+                    current = existing.get(record['date'])
                     
-                    if existing:
-                        # 更新现有记录
-                        existing.open = row.get('open')
-                        existing.high = row.get('high')
-                        existing.low = row.get('low')
-                        existing.close = row.get('close')
-                        existing.volume = row.get('volume')
-                        existing.amount = row.get('amount')
-                        existing.pct_chg = row.get('pct_chg')
-                        existing.ma5 = row.get('ma5')
-                        existing.ma10 = row.get('ma10')
-                        existing.ma20 = row.get('ma20')
-                        existing.volume_ratio = row.get('volume_ratio')
-                        existing.data_source = data_source
-                        existing.updated_at = datetime.now()
+                    if current is not None:
+                        existing_id, existing_values = current
+                        if _daily_values(record) == existing_values:
+                            continue  # 内容未变化，跳过
+                        # 更新现有记录：先收集，循环结束后批量 UPDATE，不走逐字段的属性跟踪
+                        to_update.append({**record, 'id': existing_id, 'updated_at': batch_now})
                     else:
-                        # 创建新记录
-                        record = StockDaily(
-                            code=code,
-                            date=row_date,
-                            open=row.get('open'),
-                            high=row.get('high'),
-                            low=row.get('low'),
-                            close=row.get('close'),
-                            volume=row.get('volume'),
-                            amount=row.get('amount'),
-                            pct_chg=row.get('pct_chg'),
-                            ma5=row.get('ma5'),
-                            ma10=row.get('ma10'),
-                            ma20=row.get('ma20'),
-                            volume_ratio=row.get('volume_ratio'),
-                            data_source=data_source,
-                        )
-                        session.add(record)
-                        saved_count += 1
+                        # 新记录同样先收集，批量 INSERT，不逐个构造 ORM 对象
+                        to_insert.append({**record, 'created_at': batch_now, 'updated_at': batch_now})
+                
+                if to_insert:
+                    session.bulk_insert_mappings(StockDaily, to_insert)
+                if to_update:
+                    session.bulk_update_mappings(StockDaily, to_update)
+                saved_count = len(to_insert)
+                session.commit()
+                self._mark_saved_dates(code, df['date'])
+                logger.info(f"保存 {code} 数据成功，新增 {saved_count} 条")
+                
+            except Exception as e:
+                session.rollback()
+                logger.error(f"保存 {code} 数据失败: {e}")
+                raise
+        
+        return saved_count
+    
+    @staticmethod
+    def _load_existing_daily(
+        session: Session,
+        code: str,
+        row_dates
+    ) -> Dict[date, Tuple[int, Tuple]]:
+        """
+        一次查询取得指定日期已有的日线记录
+        
+        Returns:
+            {日期: (主键, 数值列元组)}，数值列顺序同 _DAILY_VALUE_COLUMNS
+        """
+        value_columns = [getattr(StockDaily, col) for col in _DAILY_VALUE_COLUMNS]
+        rows = session.execute(
+            select(StockDaily.id, StockDaily.date, *value_columns).where(
+                and_(
+                    StockDaily.code == code,
+                    StockDaily.date.in_(set(row_dates))
+                )
+            )
+        )
+        return {row[1]: (row[0], tuple(row[2:])) for row in rows}
+    
+    def _upsert_daily_data(
+        self,
+        upsert_insert,
+        df: pd.DataFrame,
+        code: str,
+        data_source: str,
+        batch_now: datetime
+    ) -> int:
+        """
+        以单条 INSERT ... ON CONFLICT(code, date) DO UPDATE 批量写入日线数据
+        
+        由数据库完成合并，不再逐行 SELECT 判断是否存在
+        
+        Args:
+            upsert_insert: 方言对应的 insert 构造函数
+            df: 包含日线数据的 DataFrame（date 列已转换为 date 对象）
+            code: 股票代码
+            data_source: 数据来源名称
+            batch_now: 本批记录的 created_at / updated_at
+            
+        Returns:
+            新增的记录数
+        """
+        records = _daily_records(df, code, data_source)
+        for record in records:
+            record['created_at'] = batch_now  # 冲突更新时不会覆盖已有记录的 created_at
+            record['updated_at'] = batch_now
+        row_dates = [record['date'] for record in records]
+        
+        stmt = upsert_insert(StockDaily)
+        update_columns = _DAILY_VALUE_COLUMNS + ['data_source']
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['code', 'date'],
+            set_={
+                **{col: stmt.excluded[col] for col in update_columns},
+                'updated_at': batch_now,
+            },
+        )
+        
+        with self.get_session() as session:
+            try:
+                # 一次查询已有记录：统计新增条数，并剔除内容未变化的行（重复运行时整批跳过）
+                existing = self._load_existing_daily(session, code, row_dates)
+                saved_count = len(set(row_dates) - existing.keys())
+                changed = [
+                    record for record in records
+                    if record['date'] not in existing
+                    or _daily_values(record) != existing[record['date']][1]
+                ]
                 
+                if changed:
+                    session.execute(stmt, changed)
                 session.commit()
+                self._mark_saved_dates(code, row_dates)
                 logger.info(f"保存 {code} 数据成功，新增 {saved_count} 条")
                 
             except Exception as e:
@@ -532,7 +858,7 @@ class DatabaseManager:
         """
         获取分析所需的上下文数据
         
-        返回今日数据 + 昨日数据的对比信息
+        返回今日数据 + 昨日数据的对比信息（单只版本的 get_analysis_contexts）
         
         Args:
             code: 股票代码
@@ -541,43 +867,78 @@ class DatabaseManager:
         Returns:
             包含今日数据、昨日对比等信息的字典
         """
+        return self.get_analysis_contexts([code], target_date)[code]
+    
+    def get_analysis_contexts(
+        self,
+        codes: List[str],
+        target_date: Optional[date] = None
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        批量获取多只股票的分析上下文
+        
+        最近 2 天数据由 get_latest_data_bulk 一条查询取回，不再逐只往返数据库；
+        均线形态由 _analyze_ma_status_batch 对全部股票一次判断
+        
+        Args:
+            codes: 股票代码列表
+            target_date: 目标日期（默认今天）
+            
+        Returns:
+            {股票代码: 上下文字典}，无数据的代码对应 None
+        """
         if target_date is None:
             target_date = date.today()
         
         # 获取最近2天数据
-        recent_data = self.get_latest_data(code, days=2)
-        
-        if not recent_data:
-            logger.warning(f"未找到 {code} 的数据")
-            return None
+        recent_by_code = self.get_latest_data_bulk(codes, days=2)
         
-        today_data = recent_data[0]
-        yesterday_data = recent_data[1] if len(recent_data) > 1 else None
-        
-        context = {
-            'code': code,
-            'date': today_data.date.isoformat(),
-            'today': today_data.to_dict(),
-        }
-        
-        if yesterday_data:
-            context['yesterday'] = yesterday_data.to_dict()
+        contexts: Dict[str, Optional[Dict[str, Any]]] = {}
+        ma_rows: Dict[str, StockDaily] = {}  # 需要判断均线形态的今日数据
+        for code, recent_data in recent_by_code.items():
+            if not recent_data:
+                logger.warning(f"未找到 {code} 的数据")
+                contexts[code] = None
+                continue
             
-            # 计算相比昨日的变化
-            if yesterday_data.volume and yesterday_data.volume > 0:
-                context['volume_change_ratio'] = round(
-                    today_data.volume / yesterday_data.volume, 2
-                )
+            today_data = recent_data[0]
+            yesterday_data = recent_data[1] if len(recent_data) > 1 else None
             
-            if yesterday_data.close and yesterday_data.close > 0:
-                context['price_change_ratio'] = round(
-                    (today_data.close - yesterday_data.close) / yesterday_data.close * 100, 2
-                )
+            context = {
+                'code': code,
+                'date': today_data.date.isoformat(),
+                'today': today_data.to_dict(),
+            }
+            
+            if yesterday_data:
+                context['yesterday'] = yesterday_data.to_dict()
+                
+                # 计算相比昨日的变化
+                if yesterday_data.volume and yesterday_data.volume > 0:
+                    context['volume_change_ratio'] = round(
+                        today_data.volume / yesterday_data.volume, 2
+                    )
+                
+                if yesterday_data.close and yesterday_data.close > 0:
+                    context['price_change_ratio'] = round(
+                        (today_data.close - yesterday_data.close) / yesterday_data.close * 100, 2
+                    )
+                
+                ma_rows[code] = today_data
             
-            # 均线形态判断
-            context['ma_status'] = self._analyze_ma_status(today_data)
+            contexts[code] = context
+        
+        # 均线形态判断
+        if ma_rows:
+            ma_frame = pd.DataFrame.from_records(
+                [(row.close, row.ma5, row.ma10, row.ma20) for row in ma_rows.values()],
+                index=list(ma_rows),
+                columns=['close', 'ma5', 'ma10', 'ma20'],
+            )
+            for code, status in self._analyze_ma_status_batch(ma_frame).items():
+                contexts[code]['ma_status'] = status
         
-        return context
+        return contexts
     
     def _analyze_ma_status(self, data: StockDaily) -> str:
         """
@@ -604,6 +965,31 @@ class DatabaseManager:
         else:
             return "震荡整理 ↔️"
     
+    def _analyze_ma_status_batch(self, df: pd.DataFrame) -> pd.Series:
+        """
+        批量分析均线形态（_analyze_ma_status 的向量化版本）
+        
+        Args:
+            df: 包含 close / ma5 / ma10 / ma20 列的 DataFrame（每行一只股票）
+            
+        Returns:
+            与 df 同索引的形态描述 Series，判断条件与 _analyze_ma_status 一致
+        """
+        values = df.reindex(columns=['close', 'ma5', 'ma10', 'ma20'])
+        close, ma5, ma10, ma20 = values.apply(pd.to_numeric, errors='coerce').fillna(0).to_numpy(dtype=np.float64).T
+        
+        short_good = (close > ma5) & (ma5 > ma10)
+        short_bad = (close < ma5) & (ma5 < ma10)
+        bull = short_good & (ma10 > ma20) & (ma20 > 0)
+        bear = short_bad & (ma10 < ma20) & (ma20 > 0)
+        
+        status = np.select(
+            [bull, bear, short_good, short_bad],
+            ["多头排列 📈", "空头排列 📉", "短期向好 🔼", "短期走弱 🔽"],
+            default="震荡整理 ↔️",
+        )
+        return pd.Series(status, index=df.index)
+    
     def save_analysis_result(
         self,
         result,  # AnalysisResult 对象
@@ -639,7 +1025,7 @@ class DatabaseManager:
                     )
                 ).scalar_one_or_none()
                 
-                dashboard_json = json.dumps(result.dashboard, ensure_ascii=False) if result.dashboard else None
+                dashboard_json = _json_text(result.dashboard) if result.dashboard else None
                 
                 if existing:
                     existing.name = result.name
@@ -719,14 +1105,14 @@ class DatabaseManager:
                     )
                 ).scalar_one_or_none()
                 
-                indices_json = json.dumps(
+                indices_json = _json_text(
                     [{'code': idx.code, 'name': idx.name, 'close': idx.close, 'pct_chg': idx.pct_chg} 
-                     for idx in overview.indices],
-                    ensure_ascii=False
+                     for idx in overview.indices]
                 ) if overview.indices else None
                 
-                top_sectors_json = json.dumps(overview.top_sectors, ensure_ascii=False) if overview.top_sectors else None
-                bottom_sectors_json = json.dumps(overview.bottom_sectors, ensure_ascii=False) if overview.bottom_sectors else None
+                top_sectors_json = _json_text(overview.top_sectors) if overview.top_sectors else None
+                bottom_sectors_json = _json_text(overview.bottom_sectors) if overview.bottom_sectors else None
+                now = datetime.now()
                 
                 if existing:
                     existing.up_count = overview.up_count
@@ -739,7 +1125,7 @@ class DatabaseManager:
                     existing.indices = indices_json
                     existing.top_sectors = top_sectors_json
                     existing.bottom_sectors = bottom_sectors_json
-                    existing.updated_at = datetime.now()
+                    existing.updated_at = now
                     logger.debug(f"更新大盘数据: {overview_date}")
                 else:
                     record = MarketOverviewModel(
@@ -754,6 +1140,8 @@ class DatabaseManager:
                         indices=indices_json,
                         top_sectors=top_sectors_json,
                         bottom_sectors=bottom_sectors_json,
+                        created_at=now,
+                        updated_at=now,
                     )
                     session.add(record)
                     logger.debug(f"新增大盘数据: {overview_date}")
@@ -34,12 +34,32 @@
 提示：优先级数字越小越优先，同优先级按初始化顺序排列
 """
 
+import importlib
+
 from .base import BaseFetcher, DataFetcherManager
-from .efinance_fetcher import EfinanceFetcher
-from .akshare_fetcher import AkshareFetcher
-from .tushare_fetcher import TushareFetcher
-from .baostock_fetcher import BaostockFetcher
-from .yfinance_fetcher import YfinanceFetcher
+
+# 各 Fetcher 按需加载（PEP 562），只用其中一个数据源时不必导入全部实现模块
+_LAZY_FETCHERS = {
+    "EfinanceFetcher": ".efinance_fetcher",
+    "AkshareFetcher": ".akshare_fetcher",
+    "TushareFetcher": ".tushare_fetcher",
+    "BaostockFetcher": ".baostock_fetcher",
+    "YfinanceFetcher": ".yfinance_fetcher",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_FETCHERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value  # 缓存，后续访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_FETCHERS))
+
 
 __all__ = [
     "BaseFetcher",
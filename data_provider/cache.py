@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+FileCache - 数据源本地磁盘缓存
+===================================
+
+职责：
+1. 缓存日线数据（parquet）与财务数据（JSON），避免重复网络请求
+2. 按 (数据集, 股票代码, 日期范围, 复权方式) 的 MD5 生成缓存键
+3. 基于 TTL 判断缓存是否过期
+
+目录结构：
+    .cache/{provider}/{stock_code}_{hash}.parquet     # DataFrame
+    .cache/{provider}/{stock_code}_{hash}.json        # 财务数据（多张表）
+    .cache/{provider}/{stock_code}_{hash}.meta.json   # 元数据（获取时间、数据源）
+
+TTL 策略：
+- 结束日期早于今天：历史数据基本不变，默认缓存 90 天
+- 结束日期为今天或之后：盘中数据会变化，默认缓存 30 分钟
+"""
+
+import hashlib
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+from daily_stock_analysis.json_io import read_json, write_json
+
+logger = logging.getLogger(__name__)
+
+
+# 默认缓存目录与 TTL（秒）
+DEFAULT_CACHE_DIR = ".cache"
+INTRADAY_TTL = 30 * 60  # 30 分钟
+HISTORICAL_TTL = 90 * 24 * 3600  # 90 天
+
+
+class FileCache:
+    """
+    基于文件的数据缓存
+
+    使用示例：
+        cache = FileCache()
+        key = cache.make_key("daily", "600519", "20240101", "20241231", "qfq")
+        hit = cache.get_frame("daily", "600519", key, ttl=cache.ttl_for("20241231"))
+        if hit is None:
+            df = fetch(...)
+            cache.set_frame("daily", "600519", key, df, source="TuShare")
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_CACHE_DIR,
+        intraday_ttl: int = INTRADAY_TTL,
+        historical_ttl: int = HISTORICAL_TTL,
+    ):
+        """
+        初始化缓存
+
+        Args:
+            cache_dir: 缓存根目录
+            intraday_ttl: 结束日期为当天时的缓存有效期（秒）
+            historical_ttl: 纯历史区间的缓存有效期（秒）
+        """
+        self.cache_dir = Path(cache_dir)
+        self.intraday_ttl = intraday_ttl
+        self.historical_ttl = historical_ttl
+
+    @staticmethod
+    def make_key(*parts) -> str:
+        """根据任意参数生成 MD5 缓存键"""
+        raw = "|".join("" if p is None else str(p) for p in parts)
+        return hashlib.md5(raw.encode("utf-8")).hexdigest()
+
+    def ttl_for(self, end_date: str) -> int:
+        """
+        根据结束日期选择 TTL
+
+        Args:
+            end_date: 结束日期（'20240101' 或 '2024-01-01'）
+
+        Returns:
+            TTL 秒数
+        """
+        today = datetime.now().strftime("%Y%m%d")
+        if end_date.replace("-", "") < today:
+            return self.historical_ttl
+        return self.intraday_ttl
+
+    def _base_path(self, provider: str, stock_code: str, key: str) -> Path:
+        return self.cache_dir / provider / f"{stock_code}_{key}"
+
+    def _read_meta(self, base: Path, ttl: int) -> Optional[dict]:
+        """读取元数据并校验 TTL，过期或不存在返回 None"""
+        meta_path = base.with_name(base.name + ".meta.json")
+        if not meta_path.exists():
+            return None
+        try:
+            meta = read_json(meta_path)
+        except (OSError, ValueError) as e:
+            logger.debug(f"[缓存] 元数据读取失败 {meta_path}: {e}")
+            return None
+        if time.time() - meta.get("fetched_at", 0) > ttl:
+            return None
+        return meta
+
+    def _write_meta(self, base: Path, source: str) -> None:
+        meta_path = base.with_name(base.name + ".meta.json")
+        meta = {"fetched_at": time.time(), "source": source}
+        write_json(meta_path, meta)
+
+    def get_frame(
+        self, provider: str, stock_code: str, key: str, ttl: int
+    ) -> Optional[Tuple[pd.DataFrame, str]]:
+        """
+        读取缓存的 DataFrame
+
+        Returns:
+            (DataFrame, 数据源名称)，未命中或已过期返回 None
+        """
+        base = self._base_path(provider, stock_code, key)
+        meta = self._read_meta(base, ttl)
+        if meta is None:
+            return None
+
+        data_path = base.with_name(base.name + ".parquet")
+        try:
+            df = pd.read_parquet(data_path, engine="pyarrow")
+        except Exception as e:
+            logger.debug(f"[缓存] 读取失败 {data_path}: {e}")
+            return None
+
+        logger.info(f"[缓存命中] {provider} {stock_code} ({len(df)} 条)")
+        return df, meta.get("source", "cache")
+
+    def set_frame(
+        self, provider: str, stock_code: str, key: str, df: pd.DataFrame, source: str
+    ) -> None:
+        """写入 DataFrame 缓存（失败只记录日志，不影响主流程）"""
+        base = self._base_path(provider, stock_code, key)
+        try:
+            base.parent.mkdir(parents=True, exist_ok=True)
+            df.to_parquet(
+                base.with_name(base.name + ".parquet"), engine="pyarrow", index=False
+            )
+            self._write_meta(base, source)
+        except Exception as e:
+            logger.warning(f"[缓存] 写入失败 {base}: {e}")
+
+    def get_frames(
+        self, provider: str, stock_code: str, key: str, ttl: int
+    ) -> Optional[Tuple[Dict[str, pd.DataFrame], str]]:
+        """
+        读取缓存的多张表（如财务数据）
+
+        Returns:
+            ({表名: DataFrame}, 数据源名称)，未命中或已过期返回 None
+        """
+        base = self._base_path(provider, stock_code, key)
+        meta = self._read_meta(base, ttl)
+        if meta is None:
+            return None
+
+        data_path = base.with_name(base.name + ".json")
+        try:
+            payload = read_json(data_path)
+            result = {name: pd.DataFrame(**table) for name, table in payload.items()}
+        except Exception as e:
+            logger.debug(f"[缓存] 读取失败 {data_path}: {e}")
+            return None
+
+        logger.info(f"[缓存命中] {provider} {stock_code} ({list(result.keys())})")
+        return result, meta.get("source", "cache")
+
+    def set_frames(
+        self,
+        provider: str,
+        stock_code: str,
+        key: str,
+        frames: Dict[str, pd.DataFrame],
+        source: str,
+    ) -> None:
+        """写入多张表缓存（JSON，orient='split'）"""
+        base = self._base_path(provider, stock_code, key)
+        try:
+            base.parent.mkdir(parents=True, exist_ok=True)
+            payload = {
+                name: df.to_dict(orient="split") for name, df in frames.items()
+            }
+            write_json(base.with_name(base.name + ".json"), payload, default=str)
+            self._write_meta(base, source)
+        except Exception as e:
+            logger.warning(f"[缓存] 写入失败 {base}: {e}")
@@ -5,22 +5,193 @@
 优先级: TuShare (P0) → Baostock (P0备用) → AkShare (P2补充)
 """
 
+import numpy as np
 import pandas as pd
+import requests
+import types
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional, Tuple
 import logging
+import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from data_provider.cache import FileCache
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class DataSourceFallback:
-    """数据源降级策略管理器"""
+# 进程内共享的 HTTP 连接池：复用 TCP+TLS 连接，避免每次请求重新握手
+_SESSION = requests.Session()
+_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=32,
+    max_retries=Retry(total=3, backoff_factor=0.3),
+)
+_SESSION.mount("https://", _ADAPTER)
+_SESSION.mount("http://", _ADAPTER)
+
+# Baostock 会话空闲超时（秒），超过后重新登录
+BAOSTOCK_IDLE_TIMEOUT = 600
+
+
+def _use_shared_session(module) -> None:
+    """
+    让第三方模块内部的 requests.get/post 走共享连接池
+
+    只替换目标模块命名空间中的 requests 引用，不影响全局 requests 模块
+    """
+    if getattr(module, "requests", None) is None or getattr(
+        module.requests, "_shared_session", False
+    ):
+        return
+    shim = types.ModuleType("requests")
+    shim.__dict__.update(vars(requests))
+    shim.get = _SESSION.get
+    shim.post = _SESSION.post
+    shim._shared_session = True
+    module.requests = shim
+
+
+def _result_to_frame(rs, expected_rows: int = 16) -> pd.DataFrame:
+    """
+    将 Baostock 查询结果读取为 DataFrame
+
+    按预估行数预分配 object 缓冲区并按下标填充，行数超出时按 2 倍扩容，
+    避免逐行 list.append 再整体复制
+
+    若结果只有一页（行数小于分页大小），全部行已随查询返回并保存在 rs.data 中，
+    直接整体构建 DataFrame，跳过逐行 next()/get_row_data() 调用
+
+    Args:
+        rs: Baostock 查询结果
+        expected_rows: 预估行数
+    """
+    rows = getattr(rs, "data", None)
+    per_page = getattr(rs, "per_page_count", None)
+    if (
+        isinstance(rows, list)
+        and isinstance(per_page, int)
+        and len(rows) < per_page
+        and getattr(rs, "cur_row_num", 0) == 0
+    ):
+        return pd.DataFrame(rows, columns=rs.fields)
+
+    buf = np.empty((max(expected_rows, 16), len(rs.fields)), dtype=object)
+    i = 0
+    while (rs.error_code == "0") & rs.next():
+        if i >= buf.shape[0]:
+            grown = np.empty((buf.shape[0] * 2, buf.shape[1]), dtype=object)
+            grown[:i] = buf
+            buf = grown
+        buf[i] = rs.get_row_data()
+        i += 1
+    return pd.DataFrame(buf[:i], columns=rs.fields)
+
+
+# Baostock 日线数值列：价格类用 float32 即可覆盖精度，成交量/额数值较大保留 float64
+_BAOSTOCK_FLOAT32_COLS = ["open", "high", "low", "close", "preclose", "turn", "pctChg"]
+_BAOSTOCK_FLOAT64_COLS = ["volume", "amount"]
+
+
+def _coerce_baostock_daily(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Baostock 返回的全是字符串，入库前一次性转换为数值/日期类型
+
+    避免下游每次 rolling/比较时隐式转换
+    """
+    cols32 = [c for c in _BAOSTOCK_FLOAT32_COLS if c in df.columns]
+    cols64 = [c for c in _BAOSTOCK_FLOAT64_COLS if c in df.columns]
+    if cols32:
+        df[cols32] = df[cols32].apply(pd.to_numeric, errors="coerce").astype("float32")
+    if cols64:
+        df[cols64] = df[cols64].apply(pd.to_numeric, errors="coerce").astype("float64")
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    return df
+
+
+@lru_cache(maxsize=1024)
+def _to_dash_hyphen(date_str: str) -> Tuple[str, str]:
+    """
+    将日期统一为两种格式（结果缓存）
+
+    Args:
+        date_str: '20240101' 或 '2024-01-01'
+
+    Returns:
+        ('20240101', '2024-01-01')
+    """
+    s = date_str.replace("-", "")
+    return s, f"{s[:4]}-{s[4:6]}-{s[6:]}"
+
+
+# 定期报告法定披露截止日（月日）：一季报 4/30、半年报 8/31、三季报 10/31，年报次年 4/30
+_DISCLOSURE_DEADLINES = {1: "0430", 2: "0831", 3: "1031", 4: "0430"}
+
+
+def _disclosure_deadline(year: int, quarter: int) -> str:
+    """返回指定报告期的披露截止日（YYYYMMDD）"""
+    deadline_year = year + 1 if quarter == 4 else year
+    return f"{deadline_year}{_DISCLOSURE_DEADLINES[quarter]}"
+
+
+@lru_cache(maxsize=4096)
+def _to_tushare_code(stock_code: str) -> str:
+    """转换为 TuShare 代码格式（模块级缓存，避免 lru_cache 持有 self）"""
+    if "." in stock_code:
+        return stock_code
+
+    if stock_code.startswith("6"):
+        return f"{stock_code}.SH"
+    elif stock_code.startswith("0") or stock_code.startswith("3"):
+        return f"{stock_code}.SZ"
+    elif stock_code.startswith("8") or stock_code.startswith("4"):
+        return f"{stock_code}.BJ"
+    else:
+        return f"{stock_code}.SH"
+
+
+@lru_cache(maxsize=4096)
+def _to_baostock_code(stock_code: str) -> str:
+    """转换为 Baostock 代码格式（模块级缓存）"""
+    if "." in stock_code:
+        parts = stock_code.split(".")
+        return f"{parts[1].lower()}.{parts[0]}"
+
+    if stock_code.startswith("6"):
+        return f"sh.{stock_code}"
+    elif stock_code.startswith("0") or stock_code.startswith("3"):
+        return f"sz.{stock_code}"
+    elif stock_code.startswith("8") or stock_code.startswith("4"):
+        return f"bj.{stock_code}"
+    else:
+        return f"sh.{stock_code}"
+
 
-    def __init__(self, tushare_token: Optional[str] = None):
+class DataSourceFallback:
+    """
+    数据源降级策略管理器
+
+    推荐以上下文管理器方式使用，退出时自动登出 Baostock：
+        with DataSourceFallback(tushare_token) as fetcher:
+            df, source = fetcher.get_daily_data(...)
+    """
+
+    def __init__(
+        self,
+        tushare_token: Optional[str] = None,
+        cache: Optional[FileCache] = None,
+        use_cache: bool = True,
+    ):
         self.tushare_token = tushare_token
         self.tushare_api = None
         self.baostock_logged_in = False
+        self._baostock_last_used = 0.0
+        self.cache = (cache or FileCache()) if use_cache else None
 
         if tushare_token:
             try:
@@ -28,14 +199,36 @@ class DataSourceFallback:
 
                 ts.set_token(tushare_token)
                 self.tushare_api = ts.pro_api()
+                try:
+                    import tushare.pro.client as ts_client
+
+                    _use_shared_session(ts_client)
+                except ImportError:
+                    pass
                 logger.info("✅ TuShare 初始化成功")
             except Exception as e:
                 logger.warning(f"⚠️ TuShare 初始化失败: {e}")
 
+    def __enter__(self) -> "DataSourceFallback":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """退出上下文时确定性地登出 Baostock"""
+        self._logout_baostock()
+
     def _login_baostock(self) -> bool:
-        """登录 Baostock"""
+        """
+        登录 Baostock
+
+        登录状态在多次调用间复用；空闲超过 BAOSTOCK_IDLE_TIMEOUT 后服务端可能已断开，
+        此时先登出再重新登录
+        """
         if self.baostock_logged_in:
-            return True
+            if time.monotonic() - self._baostock_last_used < BAOSTOCK_IDLE_TIMEOUT:
+                self._baostock_last_used = time.monotonic()
+                return True
+            logger.info("Baostock 会话空闲超时，重新登录")
+            self._logout_baostock()
 
         try:
             import baostock as bs
@@ -43,6 +236,7 @@ class DataSourceFallback:
             lg = bs.login()
             if lg.error_code == "0":
                 self.baostock_logged_in = True
+                self._baostock_last_used = time.monotonic()
                 logger.info("✅ Baostock 登录成功")
                 return True
             else:
@@ -79,19 +273,42 @@ class DataSourceFallback:
         Returns:
             (DataFrame, 数据源名称) 或 (None, 错误信息)
         """
-        start_date_dash = start_date.replace("-", "")
-        end_date_dash = end_date.replace("-", "")
-        start_date_hyphen = (
-            f"{start_date_dash[:4]}-{start_date_dash[4:6]}-{start_date_dash[6:]}"
-        )
-        end_date_hyphen = (
-            f"{end_date_dash[:4]}-{end_date_dash[4:6]}-{end_date_dash[6:]}"
-        )
+        start_date_dash, start_date_hyphen = _to_dash_hyphen(start_date)
+        end_date_dash, end_date_hyphen = _to_dash_hyphen(end_date)
 
         logger.info(
             f"📊 获取 {stock_code} 日线数据: {start_date_hyphen} ~ {end_date_hyphen}"
         )
 
+        if self.cache is None:
+            return self._fetch_daily_data(
+                stock_code, start_date_dash, end_date_dash, start_date_hyphen, end_date_hyphen, adjust
+            )
+
+        key = FileCache.make_key("daily", stock_code, start_date_dash, end_date_dash, adjust)
+        cached = self.cache.get_frame(
+            "daily", stock_code, key, ttl=self.cache.ttl_for(end_date_dash)
+        )
+        if cached is not None:
+            return cached
+
+        df, source = self._fetch_daily_data(
+            stock_code, start_date_dash, end_date_dash, start_date_hyphen, end_date_hyphen, adjust
+        )
+        if df is not None:
+            self.cache.set_frame("daily", stock_code, key, df, source)
+        return df, source
+
+    def _fetch_daily_data(
+        self,
+        stock_code: str,
+        start_date_dash: str,
+        end_date_dash: str,
+        start_date_hyphen: str,
+        end_date_hyphen: str,
+        adjust: str,
+    ) -> Tuple[Optional[pd.DataFrame], str]:
+        """按 TuShare → Baostock → AkShare 顺序获取日线数据（不经过缓存）"""
         if self.tushare_api:
             try:
                 logger.info("🔄 尝试使用 TuShare (P0主力)...")
@@ -136,11 +353,12 @@ class DataSourceFallback:
                 )
 
                 if rs.error_code == "0":
-                    data_list = []
-                    while (rs.error_code == "0") & rs.next():
-                        data_list.append(rs.get_row_data())
-
-                    df = pd.DataFrame(data_list, columns=rs.fields)
+                    # 日历日跨度是交易日行数的上界
+                    span_days = (
+                        pd.to_datetime(end_date_hyphen) - pd.to_datetime(start_date_hyphen)
+                    ).days + 1
+                    df = _result_to_frame(rs, expected_rows=span_days)
+                    df = _coerce_baostock_daily(df)
 
                     if not df.empty:
                         logger.info(f"✅ Baostock 成功获取 {len(df)} 条数据")
@@ -185,6 +403,31 @@ class DataSourceFallback:
         """
         logger.info(f"📊 获取 {stock_code} 财务数据: {year}Q{quarter}")
 
+        if self.cache is None:
+            return self._fetch_financial_data(stock_code, year, quarter)
+
+        # 以法定披露截止日判断 TTL：截止日之后报表已定稿，按历史数据缓存；
+        # 截止日之前可能尚未披露，按盘中 TTL 缓存
+        key = FileCache.make_key("financial", stock_code, year, quarter)
+        cached = self.cache.get_frames(
+            "financial",
+            stock_code,
+            key,
+            ttl=self.cache.ttl_for(_disclosure_deadline(year, quarter)),
+        )
+        if cached is not None:
+            return cached
+
+        result, source = self._fetch_financial_data(stock_code, year, quarter)
+        # 未披露季度会返回全空的报表，不写入缓存，避免后续真实数据被长期遮蔽
+        if result is not None and any(not frame.empty for frame in result.values()):
+            self.cache.set_frames("financial", stock_code, key, result, source)
+        return result, source
+
+    def _fetch_financial_data(
+        self, stock_code: str, year: int, quarter: int
+    ) -> Tuple[Optional[dict], str]:
+        """按 Baostock → AkShare 顺序获取财务数据（不经过缓存）"""
         if self._login_baostock():
             try:
                 logger.info("🔄 尝试使用 Baostock (P0主力)...")
@@ -192,37 +435,18 @@ class DataSourceFallback:
 
                 bs_code = self._convert_to_baostock_code(stock_code)
 
-                rs_profit = bs.query_profit_data(
-                    code=bs_code, year=year, quarter=quarter
-                )
-                rs_balance = bs.query_balance_data(
-                    code=bs_code, year=year, quarter=quarter
-                )
-                rs_cash = bs.query_cash_flow_data(
-                    code=bs_code, year=year, quarter=quarter
-                )
+                # baostock 所有查询共用同一个全局 socket，不能并发，只能顺序查询
+                queries = {
+                    "profit": bs.query_profit_data,
+                    "balance": bs.query_balance_data,
+                    "cashflow": bs.query_cash_flow_data,
+                }
 
                 result = {}
-
-                if rs_profit.error_code == "0":
-                    data_list = []
-                    while (rs_profit.error_code == "0") & rs_profit.next():
-                        data_list.append(rs_profit.get_row_data())
-                    result["profit"] = pd.DataFrame(data_list, columns=rs_profit.fields)
-
-                if rs_balance.error_code == "0":
-                    data_list = []
-                    while (rs_balance.error_code == "0") & rs_balance.next():
-                        data_list.append(rs_balance.get_row_data())
-                    result["balance"] = pd.DataFrame(
-                        data_list, columns=rs_balance.fields
-                    )
-
-                if rs_cash.error_code == "0":
-                    data_list = []
-                    while (rs_cash.error_code == "0") & rs_cash.next():
-                        data_list.append(rs_cash.get_row_data())
-                    result["cashflow"] = pd.DataFrame(data_list, columns=rs_cash.fields)
+                for name, query in queries.items():
+                    rs = query(code=bs_code, year=year, quarter=quarter)
+                    if rs.error_code == "0":
+                        result[name] = _result_to_frame(rs)
 
                 if result:
                     logger.info(f"✅ Baostock 成功获取财务数据")
@@ -238,17 +462,16 @@ class DataSourceFallback:
                 f"sh{stock_code}" if stock_code.startswith("6") else f"sz{stock_code}"
             )
 
-            result = {
-                "balance": ak.stock_financial_report_sina(
-                    stock=sina_code, symbol="资产负债表"
-                ),
-                "profit": ak.stock_financial_report_sina(
-                    stock=sina_code, symbol="利润表"
-                ),
-                "cashflow": ak.stock_financial_report_sina(
-                    stock=sina_code, symbol="现金流量表"
-                ),
-            }
+            # 新浪三张报表是相互独立的 HTTP 请求，并发获取
+            symbols = {"balance": "资产负债表", "profit": "利润表", "cashflow": "现金流量表"}
+            with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+                futures = {
+                    name: executor.submit(
+                        ak.stock_financial_report_sina, stock=sina_code, symbol=symbol
+                    )
+                    for name, symbol in symbols.items()
+                }
+                result = {name: future.result() for name, future in futures.items()}
 
             logger.info(f"✅ AkShare 成功获取财务数据")
             return result, "AkShare"
@@ -260,36 +483,11 @@ class DataSourceFallback:
 
     def _convert_to_tushare_code(self, stock_code: str) -> str:
         """转换为 TuShare 代码格式"""
-        if "." in stock_code:
-            return stock_code
-
-        if stock_code.startswith("6"):
-            return f"{stock_code}.SH"
-        elif stock_code.startswith("0") or stock_code.startswith("3"):
-            return f"{stock_code}.SZ"
-        elif stock_code.startswith("8") or stock_code.startswith("4"):
-            return f"{stock_code}.BJ"
-        else:
-            return f"{stock_code}.SH"
+        return _to_tushare_code(stock_code)
 
     def _convert_to_baostock_code(self, stock_code: str) -> str:
         """转换为 Baostock 代码格式"""
-        if "." in stock_code:
-            parts = stock_code.split(".")
-            return f"{parts[1].lower()}.{parts[0]}"
-
-        if stock_code.startswith("6"):
-            return f"sh.{stock_code}"
-        elif stock_code.startswith("0") or stock_code.startswith("3"):
-            return f"sz.{stock_code}"
-        elif stock_code.startswith("8") or stock_code.startswith("4"):
-            return f"bj.{stock_code}"
-        else:
-            return f"sh.{stock_code}"
-
-    def __del__(self):
-        """析构函数，确保登出 Baostock"""
-        self._logout_baostock()
+        return _to_baostock_code(stock_code)
 
 
 def demo_usage():
@@ -300,35 +498,34 @@ def demo_usage():
     load_dotenv()
     tushare_token = os.getenv("TUSHARE_TOKEN")
 
-    fetcher = DataSourceFallback(tushare_token=tushare_token)
-
-    print("\n" + "=" * 60)
-    print("示例 1: 获取日线历史数据")
-    print("=" * 60)
-    df, source = fetcher.get_daily_data(
-        stock_code="600519", start_date="20240101", end_date="20241231", adjust="qfq"
-    )
+    with DataSourceFallback(tushare_token=tushare_token) as fetcher:
+        print("\n" + "=" * 60)
+        print("示例 1: 获取日线历史数据")
+        print("=" * 60)
+        df, source = fetcher.get_daily_data(
+            stock_code="600519", start_date="20240101", end_date="20241231", adjust="qfq"
+        )
 
-    if df is not None:
-        print(f"\n✅ 数据源: {source}")
-        print(f"数据量: {len(df)} 条")
-        print(f"\n最新5条数据:")
-        print(df.head())
-    else:
-        print(f"\n❌ 获取失败: {source}")
-
-    print("\n" + "=" * 60)
-    print("示例 2: 获取财务数据")
-    print("=" * 60)
-    data, source = fetcher.get_financial_data(stock_code="600519", year=2024, quarter=3)
-
-    if data is not None:
-        print(f"\n✅ 数据源: {source}")
-        print(f"包含报表: {list(data.keys())}")
-        for name, df in data.items():
-            print(f"\n{name}: {len(df)} 条记录")
-    else:
-        print(f"\n❌ 获取失败: {source}")
+        if df is not None:
+            print(f"\n✅ 数据源: {source}")
+            print(f"数据量: {len(df)} 条")
+            print(f"\n最新5条数据:")
+            print(df.head())
+        else:
+            print(f"\n❌ 获取失败: {source}")
+
+        print("\n" + "=" * 60)
+        print("示例 2: 获取财务数据")
+        print("=" * 60)
+        data, source = fetcher.get_financial_data(stock_code="600519", year=2024, quarter=3)
+
+        if data is not None:
+            print(f"\n✅ 数据源: {source}")
+            print(f"包含报表: {list(data.keys())}")
+            for name, df in data.items():
+                print(f"\n{name}: {len(df)} 条记录")
+        else:
+            print(f"\n❌ 获取失败: {source}")
 
 
 if __name__ == "__main__":
@@ -16,14 +16,31 @@
 """
 
 import argparse
+import asyncio
+import contextlib
+import hashlib
 import logging
+import os
+import string
+import time
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from functools import lru_cache
+from pathlib import Path
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Tuple
+import numpy as np
 import pandas as pd
 
 from data_provider.akshare_fetcher import AkshareFetcher
 from daily_stock_analysis.analyzer import GeminiAnalyzer
 from daily_stock_analysis.config import get_config
+from daily_stock_analysis.indicators import (
+    INDICATOR_COLUMNS,
+    NUMBA_AVAILABLE,
+    compute_all,
+    compute_all_numpy,
+)
+from daily_stock_analysis.json_io import read_json, write_json
 
 # 配置日志
 logging.basicConfig(
@@ -33,6 +50,177 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 批量分析最大并发数
+MAX_BATCH_WORKERS = 8
+
+# 同时进行的 AI 请求数上限（Gemini 限流）
+AI_MAX_CONCURRENCY = 5
+
+# AI 分析结果缓存目录
+AI_CACHE_DIR = Path(".cache") / "ai"
+
+# 时间周期 -> 自然日天数（只读）
+_PERIOD_DAYS = MappingProxyType(
+    {
+        "5d": 5,
+        "1w": 7,
+        "2w": 14,
+        "1m": 30,
+        "3m": 90,
+        "6m": 180,
+        "1y": 365,
+    }
+)
+
+# 历史分析报告模板（模块加载时编译一次）
+_REPORT_TEMPLATE = string.Template(
+    """# 📊 ${stock_code} 历史数据分析报告
+
+## 基本信息
+- **分析日期**: ${date}
+- **数据周期**: ${first_date} ~ ${last_date}
+- **数据条数**: ${rows} 条
+
+## 最新行情
+- **收盘价**: ${close} 元
+- **涨跌幅**: ${change_pct}%
+
+${ai_section}## 均线分析
+- **MA5**: ${ma5} 元
+- **MA10**: ${ma10} 元
+- **MA20**: ${ma20} 元
+- **MA60**: ${ma60} 元
+- **趋势**: ${trend}
+
+### 乖离率
+- **MA5 乖离率**: ${bias_ma5}%
+- **MA10 乖离率**: ${bias_ma10}%
+- **MA20 乖离率**: ${bias_ma20}%
+
+## MACD 指标
+- **DIF**: ${dif}
+- **DEA**: ${dea}
+- **MACD**: ${macd}
+- **信号**: ${macd_signal}
+
+## RSI 指标
+- **RSI(14)**: ${rsi}
+- **状态**: ${rsi_signal}
+
+## 成交量分析
+- **最新成交量**: ${volume} 手
+- **5日均量**: ${avg_volume_5d} 手
+- **量比**: ${volume_ratio}
+
+## 价格统计
+- **最高价**: ${high_max} 元
+- **最低价**: ${low_min} 元
+- **振幅**: ${amplitude}
+- **平均价**: ${close_mean} 元
+
+---
+"""
+)
+
+
+@lru_cache(maxsize=2048)
+def _normalize(date_str: Optional[str]) -> Optional[str]:
+    """
+    标准化日期格式（按输入缓存）
+
+    Args:
+        date_str: 日期字符串，支持 YYYYMMDD 或 YYYY-MM-DD
+
+    Returns:
+        YYYY-MM-DD 格式的日期字符串
+    """
+    if not date_str:
+        return None
+    date_str = date_str.replace("-", "")
+    if len(date_str) == 8:
+        return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+    return date_str
+
+
+@lru_cache(maxsize=1024)
+def _period_bounds(period: str, end_date: str) -> Tuple[str, str]:
+    """
+    计算时间周期对应的日期区间（按输入缓存）
+
+    Args:
+        period: 时间周期（5d, 1w, 2w, 1m, 3m, 6m, 1y）
+        end_date: 结束日期（YYYY-MM-DD）
+
+    Returns:
+        (start_date, end_date)
+    """
+    days = _PERIOD_DAYS.get(period, 30) * 2  # 乘以2以确保有足够的交易日
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    start_date = (end_dt - timedelta(days=days)).strftime("%Y-%m-%d")
+    return start_date, end_date
+
+
+def _render_report_body(
+    stock_code: str,
+    analysis: Dict[str, Any],
+    first_date: Any,
+    last_date: Any,
+    rows: int,
+    price_stats: Tuple[float, float, float],
+    ai_analysis: Optional[str],
+) -> str:
+    """
+    渲染报告主体（不含生成时间）
+
+    Args:
+        stock_code: 股票代码
+        analysis: 分析结果
+        first_date: 数据起始日期
+        last_date: 数据结束日期
+        rows: 数据条数
+        price_stats: (最高价, 最低价, 平均价)
+        ai_analysis: AI 分析文本（可选）
+
+    Returns:
+        Markdown 格式的报告主体
+    """
+    high_max, low_min, close_mean = price_stats
+    # 最低价异常（停牌/脏数据为 0）时振幅无意义
+    amplitude = f"{(high_max - low_min) / low_min * 100:.2f}%" if low_min > 0 else "N/A"
+    ai_section = f"## 🤖 AI 智能分析\n\n{ai_analysis}\n\n---\n\n" if ai_analysis else ""
+
+    return _REPORT_TEMPLATE.substitute(
+        stock_code=stock_code,
+        date=analysis.get("date", "N/A"),
+        first_date=first_date,
+        last_date=last_date,
+        rows=rows,
+        close=f"{analysis.get('close', 0):.2f}",
+        change_pct=f"{analysis.get('change_pct', 0):+.2f}",
+        ai_section=ai_section,
+        ma5=f"{analysis.get('ma5', 0):.2f}",
+        ma10=f"{analysis.get('ma10', 0):.2f}",
+        ma20=f"{analysis.get('ma20', 0):.2f}",
+        ma60=f"{analysis.get('ma60', 0):.2f}",
+        trend=analysis.get("trend", "N/A"),
+        bias_ma5=f"{analysis.get('bias_ma5', 0):+.2f}",
+        bias_ma10=f"{analysis.get('bias_ma10', 0):+.2f}",
+        bias_ma20=f"{analysis.get('bias_ma20', 0):+.2f}",
+        dif=f"{analysis.get('dif', 0):.2f}",
+        dea=f"{analysis.get('dea', 0):.2f}",
+        macd=f"{analysis.get('macd', 0):.2f}",
+        macd_signal=analysis.get("macd_signal", "N/A"),
+        rsi=f"{analysis.get('rsi', 0):.2f}",
+        rsi_signal=analysis.get("rsi_signal", "N/A"),
+        volume=f"{analysis.get('volume', 0):,.0f}",
+        avg_volume_5d=f"{analysis.get('avg_volume_5d', 0):,.0f}",
+        volume_ratio=f"{analysis.get('volume_ratio', 0):.2f}",
+        high_max=f"{high_max:.2f}",
+        low_min=f"{low_min:.2f}",
+        amplitude=amplitude,
+        close_mean=f"{close_mean:.2f}",
+    )
+
 
 class HistoryAnalyzer:
     """历史数据分析器"""
@@ -70,12 +258,7 @@ class HistoryAnalyzer:
         Returns:
             YYYY-MM-DD 格式的日期字符串
         """
-        if not date_str:
-            return None
-        date_str = date_str.replace("-", "")
-        if len(date_str) == 8:
-            return f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-        return date_str
+        return _normalize(date_str)
 
     def parse_period(
         self, period: str, end_date: Optional[str] = None
@@ -90,28 +273,12 @@ class HistoryAnalyzer:
         Returns:
             (start_date, end_date): 开始日期和结束日期
         """
-        period_map = {
-            "5d": 5,
-            "1w": 7,
-            "2w": 14,
-            "1m": 30,
-            "3m": 90,
-            "6m": 180,
-            "1y": 365,
-        }
-
-        days = period_map.get(period, 30)
-
         if end_date:
-            end_dt = datetime.strptime(self.normalize_date(end_date), "%Y-%m-%d")
+            end_date = _normalize(end_date)
         else:
-            end_dt = datetime.now()
-
-        start_dt = end_dt - timedelta(days=days * 2)  # 乘以2以确保有足够的交易日
-        start_date = start_dt.strftime("%Y-%m-%d")
-        end_date = end_dt.strftime("%Y-%m-%d")
+            end_date = datetime.now().strftime("%Y-%m-%d")
 
-        return start_date, end_date
+        return _period_bounds(period, end_date)
 
     def get_stock_data(
         self,
@@ -167,29 +334,14 @@ class HistoryAnalyzer:
         Returns:
             包含技术指标的 DataFrame
         """
-        # 计算均线
-        if "close" in df.columns:
-            df["MA5"] = df["close"].rolling(window=5, min_periods=1).mean()
-            df["MA10"] = df["close"].rolling(window=10, min_periods=1).mean()
-            df["MA20"] = df["close"].rolling(window=20, min_periods=1).mean()
-            df["MA60"] = df["close"].rolling(window=60, min_periods=1).mean()
-
-        # 计算 EMA12 和 EMA26 用于 MACD
-        if "close" in df.columns:
-            df["EMA12"] = df["close"].ewm(span=12, adjust=False).mean()
-            df["EMA26"] = df["close"].ewm(span=26, adjust=False).mean()
-            df["DIF"] = df["EMA12"] - df["EMA26"]
-            df["DEA"] = df["DIF"].ewm(span=9, adjust=False).mean()
-            df["MACD"] = (df["DIF"] - df["DEA"]) * 2
-
-        # 计算 RSI
-        if "close" in df.columns:
-            delta = df["close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            df["RSI"] = 100 - (100 / (1 + rs))
-
+        if "close" not in df.columns:
+            return df
+
+        # numba 可用时使用单次遍历的编译内核，否则使用 NumPy / pandas 实现；一次性写回全部指标列
+        close = np.ascontiguousarray(df["close"].to_numpy(dtype=np.float64))
+        kernel = compute_all if NUMBA_AVAILABLE else compute_all_numpy
+        for col, values in zip(INDICATOR_COLUMNS, kernel(close)):
+            df[col] = values
         return df
 
     def analyze_trend(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -205,15 +357,19 @@ class HistoryAnalyzer:
         if df is None or df.empty:
             return {}
 
-        latest = df.iloc[-1]
+        # 最新一行只取一次快照，后续全部按字典读取，避免反复 .iloc 索引
+        latest = df.iloc[-1].to_dict()
+        if "CHANGE_PCT" in latest:
+            change_pct = latest["CHANGE_PCT"]
+        elif len(df) > 1:
+            prev_close = df["close"].iat[-2]
+            change_pct = (latest["close"] - prev_close) / prev_close * 100
+        else:
+            change_pct = 0
         result = {
             "date": latest["date"],
             "close": latest["close"],
-            "change_pct": (
-                (latest["close"] - df.iloc[-2]["close"]) / df.iloc[-2]["close"] * 100
-            )
-            if len(df) > 1
-            else 0,
+            "change_pct": change_pct,
         }
 
         # 均线分析
@@ -231,14 +387,10 @@ class HistoryAnalyzer:
             else:
                 result["trend"] = "震荡"
 
-            # 计算乖离率
-            result["bias_ma5"] = (latest["close"] - latest["MA5"]) / latest["MA5"] * 100
-            result["bias_ma10"] = (
-                (latest["close"] - latest["MA10"]) / latest["MA10"] * 100
-            )
-            result["bias_ma20"] = (
-                (latest["close"] - latest["MA20"]) / latest["MA20"] * 100
-            )
+            # 乖离率（已在 calculate_technical_indicators 中按整列算好）
+            result["bias_ma5"] = latest["BIAS_MA5"]
+            result["bias_ma10"] = latest["BIAS_MA10"]
+            result["bias_ma20"] = latest["BIAS_MA20"]
 
         # MACD 分析
         if "MACD" in latest:
@@ -291,7 +443,7 @@ class HistoryAnalyzer:
             # 构建分析上下文
             context = f"""
 股票代码: {stock_code}
-分析周期: {df.iloc[0]["date"]} ~ {df.iloc[-1]["date"]}
+分析周期: {df["date"].iat[0]} ~ {analysis.get("date", df["date"].iat[-1])}
 数据条数: {len(df)} 条
 
 最新行情:
@@ -330,20 +482,63 @@ RSI 指标:
 - 平均价: {df["close"].mean():.2f} 元
 """
 
-            logger.info(f"正在使用 AI 分析器分析 {stock_code}...")
-            # 调用 AI 分析器
-            ai_result = self.ai_analyzer.analyze(context, news_context="")
-
-            if ai_result and hasattr(ai_result, "dashboard"):
-                return ai_result.dashboard
-            else:
+            dashboard = self._cached_ai_analyze(stock_code, context)
+            if dashboard is None:
                 logger.warning("AI 分析器返回结果为空")
-                return None
+            return dashboard
 
         except Exception as e:
             logger.error(f"AI 分析失败: {e}")
             return None
 
+    def _cached_ai_analyze(self, stock_code: str, context: str) -> Optional[Any]:
+        """
+        调用 AI 分析器，结果按 (股票代码, 上下文, 模型) 缓存到 .cache/ai/
+
+        Args:
+            stock_code: 股票代码
+            context: 分析上下文文本
+
+        Returns:
+            AI 返回的 dashboard；失败返回 None
+        """
+        use_cache = self.config.ai_cache_enabled
+        cache_path = None
+        if use_cache:
+            model_name = (
+                getattr(self.ai_analyzer, "_current_model_name", None)
+                or self.config.gemini_model
+            )
+            digest = hashlib.blake2b(
+                f"{stock_code}\n{context}\n{model_name}".encode("utf-8"),
+                digest_size=16,
+            ).hexdigest()
+            cache_path = AI_CACHE_DIR / f"{digest}.json"
+            try:
+                if time.time() - cache_path.stat().st_mtime < self.config.ai_cache_ttl:
+                    cached = read_json(cache_path)
+                    logger.info(f"[缓存命中] {stock_code} AI 分析结果")
+                    return cached["dashboard"]
+            except (OSError, ValueError, KeyError):
+                pass
+
+        logger.info(f"正在使用 AI 分析器分析 {stock_code}...")
+        ai_result = self.ai_analyzer.analyze(context, news_context="")
+        dashboard = getattr(ai_result, "dashboard", None) if ai_result else None
+
+        if use_cache and dashboard:
+            try:
+                cache_path.parent.mkdir(parents=True, exist_ok=True)
+                write_json(
+                    cache_path,
+                    {"stock_code": stock_code, "dashboard": dashboard},
+                    default=str,
+                )
+            except OSError as e:
+                logger.warning(f"AI 分析结果缓存写入失败: {e}")
+
+        return dashboard
+
     def generate_report(
         self,
         stock_code: str,
@@ -362,65 +557,23 @@ RSI 指标:
         Returns:
             Markdown 格式的报告
         """
-        report = f"""# 📊 {stock_code} 历史数据分析报告
-
-## 基本信息
-- **分析日期**: {analysis.get("date", "N/A")}
-- **数据周期**: {df.iloc[0]["date"]} ~ {df.iloc[-1]["date"]}
-- **数据条数**: {len(df)} 条
-
-## 最新行情
-- **收盘价**: {analysis.get("close", 0):.2f} 元
-- **涨跌幅**: {analysis.get("change_pct", 0):+.2f}%
-
-"""
-
-        # 添加 AI 分析结果
-        if ai_analysis:
-            report += f"""## 🤖 AI 智能分析
-
-{ai_analysis}
-
----
-
-"""
-
-        report += f"""## 均线分析
-- **MA5**: {analysis.get("ma5", 0):.2f} 元
-- **MA10**: {analysis.get("ma10", 0):.2f} 元
-- **MA20**: {analysis.get("ma20", 0):.2f} 元
-- **MA60**: {analysis.get("ma60", 0):.2f} 元
-- **趋势**: {analysis.get("trend", "N/A")}
-
-### 乖离率
-- **MA5 乖离率**: {analysis.get("bias_ma5", 0):+.2f}%
-- **MA10 乖离率**: {analysis.get("bias_ma10", 0):+.2f}%
-- **MA20 乖离率**: {analysis.get("bias_ma20", 0):+.2f}%
-
-## MACD 指标
-- **DIF**: {analysis.get("dif", 0):.2f}
-- **DEA**: {analysis.get("dea", 0):.2f}
-- **MACD**: {analysis.get("macd", 0):.2f}
-- **信号**: {analysis.get("macd_signal", "N/A")}
-
-## RSI 指标
-- **RSI(14)**: {analysis.get("rsi", 0):.2f}
-- **状态**: {analysis.get("rsi_signal", "N/A")}
-
-## 成交量分析
-- **最新成交量**: {analysis.get("volume", 0):,.0f} 手
-- **5日均量**: {analysis.get("avg_volume_5d", 0):,.0f} 手
-- **量比**: {analysis.get("volume_ratio", 0):.2f}
-
-## 价格统计
-- **最高价**: {df["high"].max():.2f} 元
-- **最低价**: {df["low"].min():.2f} 元
-- **振幅**: {((df["high"].max() - df["low"].min()) / df["low"].min() * 100):.2f}%
-- **平均价**: {df["close"].mean():.2f} 元
-
----
-*报告生成时间: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}*
-"""
+        high_max = float(df["high"].max())
+        low_min = float(df["low"].min())
+        close_mean = float(df["close"].mean())
+
+        body = _render_report_body(
+            stock_code,
+            analysis,
+            df["date"].iat[0],
+            df["date"].iat[-1],
+            len(df),
+            (high_max, low_min, close_mean),
+            ai_analysis,
+        )
+        report = (
+            body
+            + f"*报告生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n"
+        )
         return report
 
     def run(
@@ -430,6 +583,7 @@ RSI 指标:
         end_date: Optional[str] = None,
         period: Optional[str] = None,
         output_file: Optional[str] = None,
+        save: bool = True,
     ) -> str:
         """
         运行完整的分析流程
@@ -440,6 +594,7 @@ RSI 指标:
             end_date: 结束日期（可选）
             period: 时间周期（可选）
             output_file: 输出文件路径（可选）
+            save: 是否立即保存报告（批量模式下为 False，由调用方统一写盘）
 
         Returns:
             分析报告文本
@@ -452,11 +607,8 @@ RSI 指标:
             logger.error("数据获取失败")
             return None
 
-        # 2. 计算技术指标
-        df = self.calculate_technical_indicators(df)
-
-        # 3. 分析趋势
-        analysis = self.analyze_trend(df)
+        # 2. 计算技术指标 + 3. 分析趋势
+        df, analysis = self._compute(df)
 
         # 4. AI 分析（如果启用）
         ai_analysis = None
@@ -466,23 +618,159 @@ RSI 指标:
         # 5. 生成报告
         report = self.generate_report(stock_code, analysis, df, ai_analysis)
 
-        # 5. 保存报告
-        if output_file:
-            with open(output_file, "w", encoding="utf-8") as f:
-                f.write(report)
-            logger.info(f"报告已保存至: {output_file}")
-        else:
-            # 默认保存到 reports 目录
-            import os
-
-            os.makedirs("reports", exist_ok=True)
-            filename = f"reports/history_{stock_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
-            with open(filename, "w", encoding="utf-8") as f:
-                f.write(report)
-            logger.info(f"报告已保存至: {filename}")
+        # 6. 保存报告（批量模式由调用方统一写盘）
+        if save:
+            write_reports([(output_file or _default_report_path(stock_code), report)])
 
         return report
 
+    def _compute(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """计算技术指标并分析趋势（CPU 密集，异步流程中在线程里执行）"""
+        df = self.calculate_technical_indicators(df)
+        return df, self.analyze_trend(df)
+
+    async def run_async(
+        self,
+        stock_code: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: Optional[str] = None,
+        ai_semaphore: Optional[asyncio.Semaphore] = None,
+        fetch_semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Optional[str]:
+        """
+        异步运行分析流程（不保存报告）
+
+        阻塞的数据获取、指标计算与 AI 调用均放到线程中执行，事件循环只负责调度。
+        fetch_semaphore 只包住数据获取阶段：本股票进入计算 / AI 阶段后即释放，
+        下一只股票的数据获取与本股票的计算、AI 请求重叠进行
+
+        Args:
+            stock_code: 股票代码
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            period: 时间周期（可选）
+            ai_semaphore: 限制 AI 并发请求数的信号量（可选）
+            fetch_semaphore: 限制数据获取并发数的信号量（可选）
+
+        Returns:
+            分析报告文本
+        """
+        logger.info(f"开始分析 {stock_code}")
+
+        async with fetch_semaphore or contextlib.nullcontext():
+            df = await asyncio.to_thread(
+                self.get_stock_data, stock_code, start_date, end_date, period
+            )
+        if df is None or df.empty:
+            logger.error("数据获取失败")
+            return None
+
+        # AI 上下文依赖完整指标，因此计算必须先于 AI；放到线程中执行，
+        # 不阻塞事件循环上其他股票的 AI 请求与数据获取
+        df, analysis = await asyncio.to_thread(self._compute, df)
+
+        ai_analysis = None
+        if self.enable_ai:
+            ai_analysis = await self._ai_async(stock_code, analysis, df, ai_semaphore)
+
+        return self.generate_report(stock_code, analysis, df, ai_analysis)
+
+    async def _ai_async(
+        self,
+        stock_code: str,
+        analysis: Dict[str, Any],
+        df: pd.DataFrame,
+        semaphore: Optional[asyncio.Semaphore] = None,
+    ) -> Optional[Any]:
+        """在信号量限制下于线程中执行 AI 分析，遵守 Gemini 限流"""
+        async with semaphore or contextlib.nullcontext():
+            return await asyncio.to_thread(self.get_ai_analysis, stock_code, analysis, df)
+
+    async def batch_run(
+        self,
+        stock_codes: List[str],
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        period: Optional[str] = None,
+    ) -> List[Tuple[str, Any]]:
+        """
+        批量异步分析
+
+        Args:
+            stock_codes: 股票代码列表
+            start_date: 开始日期（可选）
+            end_date: 结束日期（可选）
+            period: 时间周期（可选）
+
+        Returns:
+            [(股票代码, 报告文本 / None / 异常对象), ...]，顺序与输入一致
+        """
+        # 数据获取与 AI 调用分别限流：前者避免触发数据源反爬，后者遵守 Gemini 限流
+        fetch_semaphore = asyncio.Semaphore(MAX_BATCH_WORKERS)
+        ai_semaphore = asyncio.Semaphore(AI_MAX_CONCURRENCY)
+
+        results = await asyncio.gather(
+            *(
+                self.run_async(
+                    code,
+                    start_date,
+                    end_date,
+                    period,
+                    ai_semaphore=ai_semaphore,
+                    fetch_semaphore=fetch_semaphore,
+                )
+                for code in stock_codes
+            ),
+            return_exceptions=True,
+        )
+        return list(zip(stock_codes, results))
+
+
+def _default_report_path(stock_code: str) -> str:
+    """默认报告路径：reports/history_{code}_{时间戳}.md"""
+    return f"reports/history_{stock_code}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.md"
+
+
+def write_reports(reports: List[Tuple[str, str]]) -> None:
+    """
+    批量保存报告
+
+    所有报告生成完毕后一次性写盘：每个目录只创建一次，每个文件一次 write 调用
+
+    Args:
+        reports: [(文件路径, 报告文本), ...]
+    """
+    created_dirs = set()
+    for path, report in reports:
+        directory = os.path.dirname(path)
+        if directory and directory not in created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            created_dirs.add(directory)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(report)
+        logger.info(f"报告已保存至: {path}")
+
+
+def _output_path_for(
+    output: Optional[str], stock_code: str, total: int
+) -> Optional[str]:
+    """
+    批量分析时为每只股票生成独立的输出路径，避免并发写同一个文件
+
+    Args:
+        output: 用户指定的输出路径（可选）
+        stock_code: 股票代码
+        total: 本次分析的股票数量
+
+    Returns:
+        输出路径；未指定时返回 None（使用默认 reports 目录）
+    """
+    if not output or total <= 1:
+        return output
+    root, ext = os.path.splitext(output)
+    return f"{root}_{stock_code}{ext or '.md'}"
+
 
 def main():
     """主函数"""
@@ -533,29 +821,35 @@ def main():
     # 创建分析器（默认启用 AI，除非指定 --no-ai）
     analyzer = HistoryAnalyzer(enable_ai=not args.no_ai)
 
-    # 分析每只股票
-    for stock_code in stock_codes:
-        try:
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"分析股票: {stock_code}")
-            logger.info(f"{'=' * 60}")
-
-            report = analyzer.run(
-                stock_code=stock_code,
-                start_date=args.start_date,
-                end_date=args.end_date,
-                period=args.period,
-                output_file=args.output,
+    # 并发分析每只股票（数据获取与 AI 调用均为 I/O 密集型）
+    results = asyncio.run(
+        analyzer.batch_run(
+            stock_codes,
+            start_date=args.start_date,
+            end_date=args.end_date,
+            period=args.period,
+        )
+    )
+
+    pending = []
+    for stock_code, report in results:
+        if isinstance(report, BaseException):
+            logger.error(
+                f"分析 {stock_code} 失败: {report}",
+                exc_info=(type(report), report, report.__traceback__),
             )
+            continue
 
-            if report:
-                print("\n" + "=" * 80)
-                print(report)
-                print("=" * 80 + "\n")
+        if report:
+            output_path = _output_path_for(
+                args.output, stock_code, len(stock_codes)
+            ) or _default_report_path(stock_code)
+            pending.append((output_path, report))
+            print("\n" + "=" * 80)
+            print(report)
+            print("=" * 80 + "\n")
 
-        except Exception as e:
-            logger.error(f"分析 {stock_code} 失败: {e}", exc_info=True)
-            continue
+    write_reports(pending)
 
 
 if __name__ == "__main__":
@@ -6,7 +6,7 @@ A股自选股智能分析系统 - 主调度程序
 
 职责：
 1. 协调各模块完成股票分析流程
-2. 实现低并发的线程池调度
+2. 实现低并发的任务调度（asyncio 驱动，保留线程池版本）
 3. 全局异常处理，确保单股失败不影响整体
 4. 提供命令行入口
 
@@ -21,44 +21,207 @@ A股自选股智能分析系统 - 主调度程序
 - 效率优先：关注筹码集中度好的股票
 - 买点偏好：缩量回踩 MA5/MA10 支撑
 """
+from __future__ import annotations
+
 import os
 
+# 是否运行在 GitHub Actions 中（模块加载时读取一次）
+_IN_GHA = os.getenv("GITHUB_ACTIONS") == "true"
+
 # 代理配置 - 仅在本地环境使用，GitHub Actions 不需要
-if os.getenv("GITHUB_ACTIONS") != "true":
+if not _IN_GHA:
     # 本地开发环境，如需代理请取消注释或修改端口
     # os.environ["http_proxy"] = "http://127.0.0.1:10809"
     # os.environ["https_proxy"] = "http://127.0.0.1:10809"
     pass
 
 import argparse
+import asyncio
+import atexit
+import copy
 import logging
+import queue
+import re
 import sys
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, date, timezone, timedelta
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
-from daily_stock_analysis.feishu_doc import FeishuDocManager
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
 from daily_stock_analysis.config import get_config, Config
-from daily_stock_analysis.storage import get_db, DatabaseManager
-from data_provider import DataFetcherManager
-from data_provider.akshare_fetcher import AkshareFetcher, RealtimeQuote, ChipDistribution
-from daily_stock_analysis.analyzer import GeminiAnalyzer, AnalysisResult, STOCK_NAME_MAP
-from daily_stock_analysis.notification import NotificationService, NotificationChannel, send_daily_report
-from daily_stock_analysis.search_service import SearchService, SearchResponse
-from daily_stock_analysis.stock_analyzer import StockTrendAnalyzer, TrendAnalysisResult
-from daily_stock_analysis.market_analyzer import MarketAnalyzer
+from daily_stock_analysis.json_io import dumps as json_dumps
+
+# 分析器、数据源、通知等重量级模块在实际用到的分支内再导入，
+# --help / --market-review 等模式无需加载完整的分析链路
+if TYPE_CHECKING:
+    from data_provider.akshare_fetcher import RealtimeQuote, ChipDistribution
+    from daily_stock_analysis.analyzer import AnalysisResult
+    from daily_stock_analysis.notification import NotificationService
+    from daily_stock_analysis.stock_analyzer import TrendAnalysisResult
 
 # 配置日志格式
 LOG_FORMAT = '%(asctime)s | %(levelname)-8s | %(name)-20s | %(message)s'
 LOG_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
 
+# --stocks 参数分词：以逗号或空白分隔（保留港股 hk00700、美股 AAPL 等非 6 位代码）
+_STOCK_CODE_RE = re.compile(r'[^,\s]+')
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """
+    按秒缓存时间字符串的 Formatter
+    
+    LOG_DATE_FORMAT 精确到秒且不输出毫秒，同一秒内的记录复用上一次的
+    localtime() + strftime() 结果；仍使用本地时间，日志时间与以往一致
+    """
+    
+    default_msec_format = None
+    
+    def __init__(self, fmt: Optional[str] = None, datefmt: Optional[str] = None):
+        super().__init__(fmt, datefmt)
+        self._cached_time: Tuple[int, str] = (-1, '')
+    
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_str = self._cached_time
+        if second != cached_second:
+            cached_str = super().formatTime(record, datefmt)
+            self._cached_time = (second, cached_str)
+        return cached_str
+
+
+class JsonLogFormatter(logging.Formatter):
+    """
+    JSON Lines 格式的 Formatter（调试日志使用）
+    
+    每条记录输出为一行 JSON：{"t": 时间戳, "lvl": 级别, "n": logger 名, "msg": 消息}，
+    带异常的记录额外输出 "exc"（traceback 文本）；
+    序列化经由 json_io（安装 orjson 时使用 orjson）
+    """
+    
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "t": record.created,
+            "lvl": record.levelname,
+            "n": record.name,
+            "msg": record.getMessage(),
+        }
+        # 经过 ExcTextQueueHandler 的记录只保留 exc_text，直接挂在 handler 上时仍有 exc_info
+        if record.exc_text:
+            payload["exc"] = record.exc_text
+        elif record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json_dumps(payload, default=str).decode('utf-8')
+
+
+# ExcTextQueueHandler 预格式化 traceback 用（与 Formatter 默认输出一致）
+_EXC_FORMATTER = logging.Formatter()
+
+
+class ExcTextQueueHandler(QueueHandler):
+    """
+    保留异常文本的 QueueHandler
+    
+    标准 prepare() 会把 traceback 拼进 msg 并清空 exc_info / exc_text，
+    下游 Formatter 拿不到独立的异常信息；这里只合并消息参数，
+    traceback 预先格式化到 exc_text（traceback 对象不能安全跨线程持有），
+    由 QueueListener 中各 handler 的 Formatter 自行输出
+    """
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _EXC_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class FastRotatingFileHandler(RotatingFileHandler):
+    """
+    在进程内记录已写入字节数、带写缓冲的 RotatingFileHandler
+    
+    1. 标准实现每条记录都要 tell()/stat() 查询文件大小来判断是否轮转；
+       这里只在打开文件（含轮转后重新打开）时读取一次大小，之后按写入量累加
+    2. 文件以 64KB 缓冲打开，INFO/DEBUG 记录只写缓冲区，WARNING 及以上立即 flush；
+       其余由 setup_logging 中的后台线程定期 flush
+    """
+    
+    buffer_size = 64 * 1024
+    
+    def _open(self):
+        stream = open(
+            self.baseFilename,
+            self.mode,
+            buffering=self.buffer_size,
+            encoding=self.encoding,
+            errors=self.errors
+        )
+        self._written = stream.tell()
+        return stream
+    
+    def _encoded_size(self, msg: str) -> int:
+        return len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+    
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0:
+            return False
+        msg = f"{self.format(record)}{self.terminator}"
+        return self._written + self._encoded_size(msg) >= self.maxBytes
+    
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = f"{self.format(record)}{self.terminator}"
+            size = self._encoded_size(msg)
+            if self.stream is None:
+                self.stream = self._open()
+            if self.maxBytes > 0 and self._written + size >= self.maxBytes:
+                self.doRollover()
+                if self.stream is None:
+                    self.stream = self._open()
+            self.stream.write(msg)
+            self._written += size
+            if record.levelno >= logging.WARNING:
+                self.stream.flush()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _start_log_flusher(handlers: List[logging.Handler], interval: float = 30.0) -> None:
+    """
+    启动后台线程，定期 flush 带缓冲的文件 Handler
+    
+    Args:
+        handlers: 需要定期 flush 的 Handler
+        interval: flush 间隔（秒）
+    """
+    stop_event = threading.Event()
+    
+    def _flush_loop():
+        while not stop_event.wait(interval):
+            for handler in handlers:
+                handler.flush()
+    
+    threading.Thread(target=_flush_loop, name="log-flusher", daemon=True).start()
+    atexit.register(stop_event.set)
+
 
 def setup_logging(debug: bool = False, log_dir: str = "./logs") -> None:
     """
     配置日志系统（同时输出到控制台和文件）
     
+    根 logger 只挂一个 QueueHandler，记录入队后立即返回；
+    控制台与文件写入由 QueueListener 后台线程统一完成，不阻塞业务线程
+    
     Args:
         debug: 是否启用调试模式
         log_dir: 日志文件目录
@@ -66,45 +229,62 @@ def setup_logging(debug: bool = False, log_dir: str = "./logs") -> None:
     level = logging.DEBUG if debug else logging.INFO
     
     # 创建日志目录
-    log_path = Path(log_dir)
+    log_path = Path(log_dir).absolute()  # 只调用一次 getcwd()
     log_path.mkdir(parents=True, exist_ok=True)
     
     # 日志文件路径（按日期分文件）
-    today_str = datetime.now().strftime('%Y%m%d')
+    now = datetime.now()
+    today_str = now.strftime('%Y%m%d')
     log_file = log_path / f"stock_analysis_{today_str}.log"
-    debug_log_file = log_path / f"stock_analysis_debug_{today_str}.log"
+    debug_log_file = log_path / f"stock_analysis_debug_{today_str}.jsonl"
     
     # 创建根 logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)  # 根 logger 设为 DEBUG，由 handler 控制输出级别
     
+    # 控制台与常规日志共用同一个 Formatter 实例
+    formatter = CachedTimeFormatter(LOG_FORMAT, LOG_DATE_FORMAT)
+    
     # Handler 1: 控制台输出
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
-    console_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
-    root_logger.addHandler(console_handler)
+    console_handler.setFormatter(formatter)
     
     # Handler 2: 常规日志文件（INFO 级别，10MB 轮转）
-    file_handler = RotatingFileHandler(
+    file_handler = FastRotatingFileHandler(
         log_file,
         maxBytes=10 * 1024 * 1024,  # 10MB
         backupCount=5,
         encoding='utf-8'
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
-    root_logger.addHandler(file_handler)
+    file_handler.setFormatter(formatter)
     
-    # Handler 3: 调试日志文件（DEBUG 级别，包含所有详细信息）
-    debug_handler = RotatingFileHandler(
+    # Handler 3: 调试日志文件（DEBUG 级别，包含所有详细信息，JSON Lines 格式）
+    debug_handler = FastRotatingFileHandler(
         debug_log_file,
         maxBytes=50 * 1024 * 1024,  # 50MB
         backupCount=3,
         encoding='utf-8'
     )
     debug_handler.setLevel(logging.DEBUG)
-    debug_handler.setFormatter(logging.Formatter(LOG_FORMAT, LOG_DATE_FORMAT))
-    root_logger.addHandler(debug_handler)
+    debug_handler.setFormatter(JsonLogFormatter())
+    
+    # 三个 Handler 交给后台监听线程，根 logger 只负责入队
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(
+        log_queue,
+        console_handler,
+        file_handler,
+        debug_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)  # 退出前排空队列
+    root_logger.addHandler(ExcTextQueueHandler(log_queue))
+    
+    # 文件 Handler 带写缓冲，每 30 秒统一落盘一次（WARNING 及以上即时落盘）
+    _start_log_flusher([file_handler, debug_handler], interval=30)
     
     # 降低第三方库的日志级别
     logging.getLogger('urllib3').setLevel(logging.WARNING)
@@ -112,7 +292,7 @@ def setup_logging(debug: bool = False, log_dir: str = "./logs") -> None:
     logging.getLogger('google').setLevel(logging.WARNING)
     logging.getLogger('httpx').setLevel(logging.WARNING)
     
-    logging.info(f"日志系统初始化完成，日志目录: {log_path.absolute()}")
+    logging.info(f"日志系统初始化完成，日志目录: {log_path}")
     logging.info(f"常规日志: {log_file}")
     logging.info(f"调试日志: {debug_log_file}")
 
@@ -142,6 +322,14 @@ class StockAnalysisPipeline:
             config: 配置对象（可选，默认使用全局配置）
             max_workers: 最大并发线程数（可选，默认从配置读取）
         """
+        from daily_stock_analysis.storage import get_db
+        from data_provider import DataFetcherManager
+        from data_provider.akshare_fetcher import AkshareFetcher
+        from daily_stock_analysis.analyzer import GeminiAnalyzer
+        from daily_stock_analysis.notification import NotificationService
+        from daily_stock_analysis.search_service import SearchService
+        from daily_stock_analysis.stock_analyzer import StockTrendAnalyzer
+        
         self.config = config or get_config()
         self.max_workers = max_workers or self.config.max_workers
         
@@ -230,6 +418,8 @@ class StockAnalysisPipeline:
         Returns:
             AnalysisResult 或 None（如果分析失败）
         """
+        from daily_stock_analysis.analyzer import STOCK_NAME_MAP
+        
         try:
             # 获取股票名称（优先从实时行情获取真实名称）
             stock_name = STOCK_NAME_MAP.get(code, '')
@@ -541,6 +731,76 @@ class StockAnalysisPipeline:
                 except Exception as e:
                     logger.error(f"[{code}] 任务执行失败: {e}")
         
+        return self._finish_run(stock_codes, results, start_time, dry_run, send_notification)
+    
+    async def run_async(
+        self,
+        stock_codes: Optional[List[str]] = None,
+        dry_run: bool = False,
+        send_notification: bool = True
+    ) -> List[AnalysisResult]:
+        """
+        运行完整的分析流程（asyncio 调度版）
+        
+        与 run() 流程一致，区别在于由事件循环调度各股票任务：
+        数据源与 AI 接口均为同步实现，单股处理通过 asyncio.to_thread 执行，
+        并发数由信号量限制为 max_workers
+        
+        Args:
+            stock_codes: 股票代码列表（可选，默认使用配置中的自选股）
+            dry_run: 是否仅获取数据不分析
+            send_notification: 是否发送推送通知
+            
+        Returns:
+            分析结果列表
+        """
+        start_time = time.time()
+        
+        if stock_codes is None:
+            stock_codes = self.config.stock_list
+        
+        if not stock_codes:
+            logger.error("未配置自选股列表，请在 .env 文件中设置 STOCK_LIST")
+            return []
+        
+        logger.info(f"===== 开始分析 {len(stock_codes)} 只股票 =====")
+        logger.info(f"股票列表: {', '.join(stock_codes)}")
+        logger.info(f"并发数: {self.max_workers}, 模式: {'仅获取数据' if dry_run else '完整分析'}")
+        
+        # 信号量限制同时处理的股票数，避免触发反爬
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def _process(code: str) -> Optional[AnalysisResult]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    self.process_single_stock,
+                    code,
+                    skip_analysis=dry_run
+                )
+        
+        outcomes = await asyncio.gather(
+            *(_process(code) for code in stock_codes),
+            return_exceptions=True
+        )
+        
+        results: List[AnalysisResult] = []
+        for code, outcome in zip(stock_codes, outcomes):
+            if isinstance(outcome, BaseException):
+                logger.error(f"[{code}] 任务执行失败: {outcome}")
+            elif outcome:
+                results.append(outcome)
+        
+        return self._finish_run(stock_codes, results, start_time, dry_run, send_notification)
+    
+    def _finish_run(
+        self,
+        stock_codes: List[str],
+        results: List[AnalysisResult],
+        start_time: float,
+        dry_run: bool,
+        send_notification: bool
+    ) -> List[AnalysisResult]:
+        """统计成功/失败数量并展示结果（run / run_async 共用）"""
         # 统计
         elapsed_time = time.time() - start_time
         
@@ -697,6 +957,13 @@ def parse_arguments() -> argparse.Namespace:
         help='并发线程数（默认使用配置值）'
     )
     
+    parser.add_argument(
+        '--summary-top',
+        type=int,
+        default=10,
+        help='结果摘要中输出到常规日志的股票数量（按评分排序，默认 10，其余仅写入调试日志）'
+    )
+    
     parser.add_argument(
         '--schedule',
         action='store_true',
@@ -760,6 +1027,8 @@ def run_market_review(notifier: NotificationService, analyzer=None, search_servi
     Returns:
         复盘报告文本
     """
+    from daily_stock_analysis.market_analyzer import MarketAnalyzer
+
     logger.info("开始执行大盘复盘分析...")
 
     try:
@@ -801,6 +1070,26 @@ def run_market_review(notifier: NotificationService, analyzer=None, search_servi
     return None
 
 
+def resolve_workers(requested: Optional[int], config: Config) -> int:
+    """
+    计算实际并发数
+    
+    未指定 --workers 时使用配置的 MAX_WORKERS（数据源限流上限），
+    并以 min(32, CPU 核数 + 4)（与 asyncio.to_thread 默认线程池大小一致）封顶，
+    超出线程池容量的并发数只会排队，没有意义
+    
+    Args:
+        requested: 命令行指定的并发数（可选）
+        config: 配置对象
+        
+    Returns:
+        并发数（至少为 1）
+    """
+    ceiling = min(32, (os.cpu_count() or 1) + 4)
+    workers = requested or config.max_workers
+    return max(1, min(workers, ceiling))
+
+
 def run_full_analysis(
     config: Config,
     args: argparse.Namespace,
@@ -809,17 +1098,30 @@ def run_full_analysis(
     """
     执行完整的分析流程（个股 + 大盘复盘）
     
-    这是定时任务调用的主函数
+    这是定时任务调用的主函数，内部通过 asyncio.run 驱动异步流程
+    """
+    asyncio.run(run_full_analysis_async(config, args, stock_codes))
+
+
+async def run_full_analysis_async(
+    config: Config,
+    args: argparse.Namespace,
+    stock_codes: Optional[List[str]] = None
+):
+    """
+    执行完整的分析流程（asyncio 版）
+    
+    个股分析由事件循环并发调度；大盘复盘为同步实现，放到线程中执行
     """
     try:
         # 创建调度器
         pipeline = StockAnalysisPipeline(
             config=config,
-            max_workers=args.workers
+            max_workers=resolve_workers(args.workers, config)
         )
         
         # 1. 运行个股分析
-        results = pipeline.run(
+        results = await pipeline.run_async(
             stock_codes=stock_codes,
             dry_run=args.dry_run,
             send_notification=not args.no_notify
@@ -829,7 +1131,8 @@ def run_full_analysis(
         market_report = ""
         if config.market_review_enabled and not args.no_market_review:
             # 只调用一次，并获取结果
-            review_result = run_market_review(
+            review_result = await asyncio.to_thread(
+                run_market_review,
                 notifier=pipeline.notifier,
                 analyzer=pipeline.analyzer,
                 search_service=pipeline.search_service
@@ -839,19 +1142,27 @@ def run_full_analysis(
                 market_report = review_result
         
         # 输出摘要
-        if results:
+        # INFO 被过滤时跳过排序与格式化；仅评分前 N 名输出到 INFO，其余只写调试日志
+        if results and logger.isEnabledFor(logging.INFO):
             logger.info("\n===== 分析结果摘要 =====")
-            for r in sorted(results, key=lambda x: x.sentiment_score, reverse=True):
-                emoji = r.get_emoji()
+            ranked = sorted(results, key=lambda x: x.sentiment_score, reverse=True)
+            for i, r in enumerate(ranked):
+                logger.log(
+                    logging.INFO if i < args.summary_top else logging.DEBUG,
+                    "%s %s(%s): %s | 评分 %s | %s",
+                    r.get_emoji(), r.name, r.code, r.operation_advice,
+                    r.sentiment_score, r.trend_prediction
+                )
+            if len(ranked) > args.summary_top:
                 logger.info(
-                    f"{emoji} {r.name}({r.code}): {r.operation_advice} | "
-                    f"评分 {r.sentiment_score} | {r.trend_prediction}"
+                    "其余 %d 只股票的摘要已写入调试日志",
+                    len(ranked) - args.summary_top
                 )
         
         logger.info("\n任务执行完成")
 
     except Exception as e:
-        logger.exception(f"分析流程执行失败: {e}")
+        logger.error("分析流程执行失败: %s", e, exc_info=True)
 
 
 def main() -> int:
@@ -877,19 +1188,21 @@ def main() -> int:
     
     # 验证配置
     warnings = config.validate()
-    for warning in warnings:
-        logger.warning(warning)
-    
-    # 解析股票列表
-    stock_codes = None
-    if args.stocks:
-        stock_codes = [code.strip() for code in args.stocks.split(',') if code.strip()]
-        logger.info(f"使用命令行指定的股票列表: {stock_codes}")
+    if warnings:
+        logger.warning("配置警告:\n  - " + "\n  - ".join(warnings))
     
     try:
         # 模式1: 仅大盘复盘
         if args.market_review:
             logger.info("模式: 仅大盘复盘")
+            
+            # 未配置任何搜索 / AI Key 时不加载对应 SDK，复盘退化为基于行情数据的模板报告
+            has_search = bool(config.bocha_api_keys or config.tavily_api_keys or config.serpapi_keys)
+            if not has_search and not config.gemini_api_key:
+                logger.warning("未配置搜索引擎与 Gemini API Key，大盘复盘将仅基于行情数据生成模板报告")
+            
+            from daily_stock_analysis.notification import NotificationService
+            
             notifier = NotificationService()
             
             # 初始化搜索服务和分析器（如果有配置）
@@ -897,23 +1210,31 @@ def main() -> int:
             analyzer = None
             
             if config.tavily_api_keys or config.serpapi_keys:
+                from daily_stock_analysis.search_service import SearchService
                 search_service = SearchService(
                     tavily_keys=config.tavily_api_keys,
                     serpapi_keys=config.serpapi_keys
                 )
             
             if config.gemini_api_key:
+                from daily_stock_analysis.analyzer import GeminiAnalyzer
                 analyzer = GeminiAnalyzer(api_key=config.gemini_api_key)
 
             run_market_review(notifier, analyzer, search_service, target_date=args.date)
             return 0
         
+        # 解析股票列表（仅个股分析模式需要，大盘复盘模式已在上方返回）
+        stock_codes = None
+        if args.stocks:
+            stock_codes = _STOCK_CODE_RE.findall(args.stocks)
+            logger.info(f"使用命令行指定的股票列表: {stock_codes}")
+        
         # 模式2: 定时任务模式
         if args.schedule or config.schedule_enabled:
             logger.info("模式: 定时任务")
             logger.info(f"每日执行时间: {config.schedule_time}")
             
-            from scheduler import run_with_schedule
+            from daily_stock_analysis.scheduler import run_with_schedule
             
             def scheduled_task():
                 run_full_analysis(config, args, stock_codes)
@@ -936,7 +1257,7 @@ def main() -> int:
         return 130
         
     except Exception as e:
-        logger.exception(f"程序执行失败: {e}")
+        logger.error("程序执行失败: %s", e, exc_info=True)
         return 1
 
 
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+技术指标内核测试
+===================================
+
+与原先的 pandas 实现逐项对比（含缺失值的价格序列）
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from daily_stock_analysis.indicators import INDICATOR_COLUMNS, compute_all, compute_all_numpy, moving_averages
+
+WINDOWS = (5, 10, 20, 60)
+
+
+def _close_series(n: int = 250, seed: int = 7) -> np.ndarray:
+    """随机游走收盘价"""
+    rng = np.random.default_rng(seed)
+    return 100.0 + np.cumsum(rng.normal(0.0, 1.0, n))
+
+
+def _with_gaps(close: np.ndarray) -> np.ndarray:
+    """插入缺失值：开头、零散单点、连续整段（超过 MA5 窗口）"""
+    gapped = close.copy()
+    gapped[0] = np.nan
+    gapped[[17, 42, 43, 120]] = np.nan
+    gapped[70:77] = np.nan
+    return gapped
+
+
+@pytest.mark.parametrize("transform", [lambda c: c, _with_gaps], ids=["dense", "gaps"])
+def test_moving_averages_match_pandas_rolling(transform):
+    close = transform(_close_series())
+    expected = [pd.Series(close).rolling(window=k, min_periods=1).mean().to_numpy() for k in WINDOWS]
+
+    for k, actual, want in zip(WINDOWS, moving_averages(close, WINDOWS), expected):
+        np.testing.assert_allclose(actual, want, rtol=1e-10, equal_nan=True, err_msg=f"MA{k}")
+
+
+def test_moving_averages_short_series():
+    close = np.array([10.0, np.nan, 12.0])
+    for actual, k in zip(moving_averages(close, WINDOWS), WINDOWS):
+        want = pd.Series(close).rolling(window=k, min_periods=1).mean().to_numpy()
+        np.testing.assert_allclose(actual, want, equal_nan=True)
+
+
+@pytest.mark.parametrize("transform", [lambda c: c, _with_gaps], ids=["dense", "gaps"])
+def test_compute_all_matches_pandas(transform):
+    close = transform(_close_series())
+    result = dict(zip(INDICATOR_COLUMNS, compute_all(np.ascontiguousarray(close))))
+
+    series = pd.Series(close)
+    for k in WINDOWS:
+        want = series.rolling(window=k, min_periods=1).mean().to_numpy()
+        np.testing.assert_allclose(result[f"MA{k}"], want, rtol=1e-10, equal_nan=True, err_msg=f"MA{k}")
+
+    ema12 = series.ewm(span=12, adjust=False).mean()
+    ema26 = series.ewm(span=26, adjust=False).mean()
+    dif = ema12 - ema26
+    dea = dif.ewm(span=9, adjust=False).mean()
+    expected = {
+        "EMA12": ema12,
+        "EMA26": ema26,
+        "DIF": dif,
+        "DEA": dea,
+        "MACD": (dif - dea) * 2,
+    }
+    for col, want in expected.items():
+        np.testing.assert_allclose(result[col], want.to_numpy(), rtol=1e-10, atol=1e-10, equal_nan=True, err_msg=col)
+
+    # 乖离率只在收盘价缺失的当天为 NaN，不会向后传染
+    for k in (5, 10, 20):
+        bias = result[f"BIAS_MA{k}"]
+        np.testing.assert_array_equal(np.isnan(bias), np.isnan(close))
+        want = (close - result[f"MA{k}"]) / result[f"MA{k}"] * 100
+        np.testing.assert_allclose(bias, want, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.parametrize("transform", [lambda c: c, _with_gaps], ids=["dense", "gaps"])
+def test_compute_all_matches_numpy_path(transform):
+    """numba 内核（未安装 numba 时为同一份纯 Python 代码）与 NumPy 回退路径输出一致"""
+    close = np.ascontiguousarray(transform(_close_series()))
+
+    for col, kernel, fallback in zip(INDICATOR_COLUMNS, compute_all(close), compute_all_numpy(close)):
+        np.testing.assert_allclose(kernel, fallback, rtol=1e-10, atol=1e-10, equal_nan=True, err_msg=col)
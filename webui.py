@@ -32,6 +32,7 @@ from __future__ import annotations
 
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 从 web 包导入（新架构）
 from web.server import WebServer, run_server_in_thread, run_server
@@ -65,40 +66,60 @@ __all__ = [
 ]
 
 
+def _start_dingtalk_stream() -> None:
+    """启动钉钉 Stream 客户端"""
+    try:
+        from bot.platforms import start_dingtalk_stream_background, DINGTALK_STREAM_AVAILABLE
+        if DINGTALK_STREAM_AVAILABLE:
+            if start_dingtalk_stream_background():
+                logger.info("[WebUI] 钉钉 Stream 客户端已在后台启动")
+            else:
+                logger.warning("[WebUI] 钉钉 Stream 客户端启动失败")
+        else:
+            logger.warning("[WebUI] 钉钉 Stream 模式已启用但 SDK 未安装")
+            logger.warning("[WebUI] 请运行: pip install dingtalk-stream")
+    except Exception as e:
+        logger.error(f"[WebUI] 启动钉钉 Stream 客户端失败: {e}")
+
+
+def _start_feishu_stream() -> None:
+    """启动飞书 Stream 客户端"""
+    try:
+        from bot.platforms import start_feishu_stream_background, FEISHU_SDK_AVAILABLE
+        if FEISHU_SDK_AVAILABLE:
+            if start_feishu_stream_background():
+                logger.info("[WebUI] 飞书 Stream 客户端已在后台启动")
+            else:
+                logger.warning("[WebUI] 飞书 Stream 客户端启动失败")
+        else:
+            logger.warning("[WebUI] 飞书 Stream 模式已启用但 SDK 未安装")
+            logger.warning("[WebUI] 请运行: pip install lark-oapi")
+    except Exception as e:
+        logger.error(f"[WebUI] 启动飞书 Stream 客户端失败: {e}")
+
+
 def _start_bot_stream_clients() -> None:
-    """启动 Bot Stream 模式客户端（如果已配置）"""
+    """
+    启动 Bot Stream 模式客户端（如果已配置）
+    
+    各客户端启动时需要建连、获取 token，互不依赖，并行启动
+    """
     from daily_stock_analysis.config import get_config
     config = get_config()
     
-    # 钉钉 Stream 模式
+    starters = []
     if config.dingtalk_stream_enabled:
-        try:
-            from bot.platforms import start_dingtalk_stream_background, DINGTALK_STREAM_AVAILABLE
-            if DINGTALK_STREAM_AVAILABLE:
-                if start_dingtalk_stream_background():
-                    logger.info("[WebUI] 钉钉 Stream 客户端已在后台启动")
-                else:
-                    logger.warning("[WebUI] 钉钉 Stream 客户端启动失败")
-            else:
-                logger.warning("[WebUI] 钉钉 Stream 模式已启用但 SDK 未安装")
-                logger.warning("[WebUI] 请运行: pip install dingtalk-stream")
-        except Exception as e:
-            logger.error(f"[WebUI] 启动钉钉 Stream 客户端失败: {e}")
-
-    # 飞书 Stream 模式
+        starters.append(_start_dingtalk_stream)
     if getattr(config, 'feishu_stream_enabled', False):
-        try:
-            from bot.platforms import start_feishu_stream_background, FEISHU_SDK_AVAILABLE
-            if FEISHU_SDK_AVAILABLE:
-                if start_feishu_stream_background():
-                    logger.info("[WebUI] 飞书 Stream 客户端已在后台启动")
-                else:
-                    logger.warning("[WebUI] 飞书 Stream 客户端启动失败")
-            else:
-                logger.warning("[WebUI] 飞书 Stream 模式已启用但 SDK 未安装")
-                logger.warning("[WebUI] 请运行: pip install lark-oapi")
-        except Exception as e:
-            logger.error(f"[WebUI] 启动飞书 Stream 客户端失败: {e}")
+        starters.append(_start_feishu_stream)
+    
+    if not starters:
+        return
+    
+    with ThreadPoolExecutor(max_workers=len(starters)) as executor:
+        futures = [executor.submit(starter) for starter in starters]
+        for future in as_completed(futures):
+            future.result()
 
 
 def main() -> int: